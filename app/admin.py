@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import User, UserProfile, DiabeticProfile, UserMeal, FoodItem,Feedback,PatientReminder
+from .models import User, UserProfile, DiabeticProfile, UserMeal, FoodItem,Feedback,PatientReminder,DailyNutritionSummary,AppReport,NutritionistProfile
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from .catalog import food_catalog
+from .nutrients import glycemic_load
 
 
 # ------------------------------
@@ -27,13 +29,41 @@ class CustomUserAdmin(BaseUserAdmin):
     filter_horizontal = ()
 
 
+# ------------------------------
+# Meal Admin Configuration
+# ------------------------------
+class UserMealAdmin(admin.ModelAdmin):
+    list_display = ("user", "food_name", "meal_type", "quantity", "unit", "consumed_at")
+    list_filter = ("meal_type",)
+    search_fields = ("food_name", "user__email")
+
+    def save_model(self, request, obj, form, change):
+        # Link the food item by name from the in-process catalog instead of querying for it
+        if obj.food_item_id is None and obj.food_name:
+            obj.food_item = food_catalog.get(obj.food_name)
+        if obj.food_item is not None:
+            obj.glycemic_load = glycemic_load(obj.food_item.glycemic_index, obj.carbs)
+        super().save_model(request, obj, form, change)
+
+
+# ------------------------------
+# Nutritionist Admin Configuration
+# ------------------------------
+class NutritionistProfileAdmin(admin.ModelAdmin):
+    list_display = ("user", "expert_level")
+    filter_horizontal = ("patients",)
+
+
 # ------------------------------
 # Register Models with Admin
 # ------------------------------
 admin.site.register(User, CustomUserAdmin)  # Register custom User admin
 admin.site.register(UserProfile)
 admin.site.register(DiabeticProfile)
-admin.site.register(UserMeal)
+admin.site.register(UserMeal, UserMealAdmin)
 admin.site.register(FoodItem)
 admin.site.register(Feedback)
-admin.site.register(PatientReminder)
\ No newline at end of file
+admin.site.register(PatientReminder)
+admin.site.register(DailyNutritionSummary)
+admin.site.register(AppReport)
+admin.site.register(NutritionistProfile, NutritionistProfileAdmin)
\ No newline at end of file
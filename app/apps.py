@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (registers signal receivers)
+        from .middleware import install_request_timing
+        install_request_timing()
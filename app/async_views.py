@@ -0,0 +1,109 @@
+# Async versions of the hot read endpoints, served under /api/async/.
+# Under ASGI (project/asgi.py) they run on the event loop instead of holding a
+# worker thread per request, and return the same JSON as their DRF
+# counterparts in app/views.py.
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseForbidden, JsonResponse
+from django.utils.timezone import localdate
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import ClaimsJWTAuthentication
+from .caching import response_cache_stats
+from .catalog import food_catalog
+from .dashboard import OWNER_PROMOTIONS, aget_owner_metrics
+from .models import DailyNutritionSummary, PatientReminder, User, UserProfile
+from .recommendations import recommendation_cache
+from .rollups import SUMMARY_FIELDS
+from .routers import ahas_recent_write, replica_reads
+from .targets import aget_calorie_target
+
+authenticator = ClaimsJWTAuthentication()
+
+
+def async_api_view(roles=None):
+    """
+    Authenticates the bearer token like the DRF views do (ClaimsJWTAuthentication,
+    run off the event loop) and optionally restricts the view to some roles.
+    """
+    def decorator(view_func):
+        @require_GET
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            try:
+                result = await sync_to_async(authenticator.authenticate)(request)
+            except AuthenticationFailed as error:
+                detail = error.detail if isinstance(error.detail, dict) else {"detail": error.detail}
+                return JsonResponse(detail, status=401)
+            if result is None:
+                return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+            request.user = result[0]
+            if roles is not None and request.user.role not in roles:
+                return HttpResponseForbidden("Access Denied")
+            return await view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+@async_api_view()
+async def daily_calorie_summary(request):
+    today = localdate()
+
+    async def target():
+        try:
+            return (await aget_calorie_target(request.user.id))["recommended_calories"]
+        except UserProfile.DoesNotExist:
+            return None
+
+    totals, recommended = await asyncio.gather(
+        DailyNutritionSummary.objects.filter(user_id=request.user.id, date=today).values(*SUMMARY_FIELDS).afirst(),
+        target(),
+    )
+    totals = totals or {}
+    remaining = None if recommended is None else round(recommended - totals.get("calories", 0))
+
+    return JsonResponse({
+        "date": today,
+        **{field: totals.get(field, 0) for field in SUMMARY_FIELDS},
+        "recommended_calories": recommended,
+        "remaining_calories": remaining,
+    })
+
+
+@async_api_view()
+async def recommend_calories(request):
+    try:
+        return JsonResponse(await aget_calorie_target(request.user.id))
+    except UserProfile.DoesNotExist:
+        return JsonResponse({"error": "User profile not found."}, status=404)
+
+
+@async_api_view(roles=["owner"])
+async def owner_dashboard(request):
+    metrics = await aget_owner_metrics()
+    return JsonResponse({
+        **metrics,
+        "feedback_collected": 0,
+        "promotions": OWNER_PROMOTIONS,
+        "message": "Owner dashboard data fetched successfully",
+    })
+
+
+@async_api_view(roles=["operator"])
+async def operator_report(request):
+    with replica_reads(not await ahas_recent_write(request.user.pk)):
+        user_count, reminders_sent = await asyncio.gather(
+            User.objects.filter(role="user").acount(),
+            PatientReminder.objects.exclude(sent_at=None).acount(),
+        )
+    return JsonResponse({
+        "total_users": user_count,
+        "reminders_sent": reminders_sent,
+        "food_catalog_cache": food_catalog.stats(),
+        "recommendation_cache": recommendation_cache.stats(),
+        "response_cache": response_cache_stats.stats(),
+    })
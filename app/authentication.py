@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# User fields embedded in the token; the request user is built from these alone
+CLAIM_FIELDS = ("role", "is_active")
+# How long a worker trusts its cached account state. Deactivations and role
+# changes made through User.save() apply at once (see app/signals.py); anything
+# else (queryset.update(), raw SQL) is picked up within this many seconds.
+ACCOUNT_STATE_TTL = 60
+
+
+def account_state_key(user_id):
+    return f"auth-account-state:{user_id}"
+
+
+def remember_account_state(user):
+    cache.set(account_state_key(user.pk), {field: getattr(user, field) for field in CLAIM_FIELDS}, ACCOUNT_STATE_TTL)
+
+
+def get_account_state(user_id):
+    """Current {role, is_active} of a user from the cache, or None if the user is gone."""
+    key = account_state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values(*CLAIM_FIELDS).first()
+        if state is not None:
+            cache.set(key, state, ACCOUNT_STATE_TTL)
+    return state
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login serializer that embeds the user's role and active flag in the tokens."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that builds request.user from the token claims instead of
+    selecting the User row on every request.
+    - The user only has id, role and is_active loaded; any other field is
+      fetched from the database the first time a view reads it.
+    - Tokens are checked against a short-lived cache of the account state, so a
+      deactivated user (or one whose role changed) is turned away quickly.
+    - Tokens issued before the claims existed fall back to the row lookup.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or any(field not in validated_token for field in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = get_account_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not state["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if state["role"] != validated_token["role"]:
+            raise AuthenticationFailed(_("User role has changed, please log in again"), code="role_changed")
+
+        # from_db() expects the values in model field order
+        loaded = {"id": user_id, **state}
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in loaded]
+        return User.from_db(router.db_for_read(User), field_names, [loaded[name] for name in field_names])
@@ -0,0 +1,91 @@
+import hashlib
+import time
+from collections import defaultdict
+from functools import wraps
+from threading import Lock
+
+from django.core.cache import cache
+from django.utils.timezone import localdate
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+# Data a cached response can depend on. Each has a generation stamp in the
+# cache, per user ("meals", "profile") or global ("foods"); bumping the stamp
+# changes the cache key of every response that depends on it.
+USER_GENERATIONS = ("meals", "profile")
+GLOBAL_GENERATIONS = ("foods",)
+
+
+def generation_key(name, user_id=None):
+    return f"cache-gen:{name}" if user_id is None else f"cache-gen:{name}:{user_id}"
+
+
+def invalidate_responses(name, user_id=None):
+    """Bumps a generation stamp; called from the UserMeal/UserProfile/FoodItem hooks."""
+    cache.set(generation_key(name, user_id), time.time_ns(), None)
+
+
+class ResponseCacheStats:
+    """Process-local hit/miss counters per cached view."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counts = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def record(self, view_name, hit):
+        with self._lock:
+            self._counts[view_name]["hits" if hit else "misses"] += 1
+
+    def stats(self):
+        with self._lock:
+            views = {name: dict(counts) for name, counts in self._counts.items()}
+        hits = sum(counts["hits"] for counts in views.values())
+        lookups = hits + sum(counts["misses"] for counts in views.values())
+        for counts in views.values():
+            counts["hit_rate"] = round(counts["hits"] / (counts["hits"] + counts["misses"]), 3)
+        return {"hit_rate": round(hits / lookups, 3) if lookups else None, "views": views}
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def cache_response(timeout=60, depends_on=()):
+    """
+    Caches the Response of a DRF GET handler in the shared cache, one entry
+    per user (and day).
+    - depends_on: generations from USER_GENERATIONS / GLOBAL_GENERATIONS that
+      invalidate the entry when bumped.
+    The query string is part of the key, and only 200 responses are stored.
+    Put it below role_required so access is checked before the cache.
+    """
+    def decorator(view_func):
+        view_name = view_func.__qualname__
+
+        @wraps(view_func)
+        def _wrapped_view(*args, **kwargs):
+            request = args[0] if isinstance(args[0], Request) else args[1]
+            if request.method != "GET":
+                return view_func(*args, **kwargs)
+
+            stamp_keys = [
+                generation_key(name, request.user.pk if name in USER_GENERATIONS else None)
+                for name in depends_on
+            ]
+            stamps = cache.get_many(stamp_keys)
+            query = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = ":".join([
+                "response", view_name, str(request.user.pk), str(localdate()), query,
+                *(str(stamps.get(stamp_key, 0)) for stamp_key in stamp_keys),
+            ])
+
+            cached = cache.get(key)
+            response_cache_stats.record(view_name, cached is not None)
+            if cached is not None:
+                return Response(cached)
+
+            response = view_func(*args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                cache.set(key, response.data, timeout)
+            return response
+        return _wrapped_view
+    return decorator
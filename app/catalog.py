@@ -0,0 +1,188 @@
+import time as clock
+from threading import Lock
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import Count, Max
+
+from .models import FoodItem
+
+# Shared cache key holding the current catalog version. Every worker compares it
+# with the version of its in-process copy and reloads when they differ.
+CATALOG_VERSION_KEY = "food-catalog:version"
+# How often a worker also compares its copy with the table itself, for changes
+# the version stamp cannot announce (a per-process cache, another process
+# writing to the database).
+CATALOG_RECHECK_SECONDS = 30
+
+
+def normalize_food_name(name):
+    """
+    Normalises a food name for lookups: surrounding and repeated whitespace is
+    collapsed and the result is lower-cased, so "  paneer   Tikka" == "Paneer Tikka".
+    """
+    return " ".join(str(name).split()).lower()
+
+
+class FoodCatalog:
+    """
+    Process-local, read-only copy of the FoodItem table.
+    - Loaded lazily on first use and indexed by normalised name and by id.
+    - Dropped and reloaded whenever the shared version stamp changes, which
+      happens on every FoodItem save/delete (see app/signals.py).
+    - At most CATALOG_RECHECK_SECONDS stale otherwise: after that, one
+      aggregate query compares the table's fingerprint with the copy's.
+    - Keeps hit/miss/load counters so we can see how often the database is hit.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._version = None
+        self._load_id = None
+        self._items = None
+        self._by_name = {}
+        self._by_id = {}
+        self._derived = {}
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def _current_version(self):
+        return cache.get_or_set(CATALOG_VERSION_KEY, uuid4().hex, None)
+
+    def _database_changed(self):
+        """Compares the table with the loaded copy, at most every CATALOG_RECHECK_SECONDS."""
+        if clock.monotonic() - self._checked_at < CATALOG_RECHECK_SECONDS:
+            return False
+        # (row count, last id, last update) changes on any insert, delete or update
+        current = FoodItem.objects.aggregate(count=Count("id"), last_id=Max("id"), updated_at=Max("updated_at"))
+        if (current["count"], current["last_id"], current["updated_at"]) != self._fingerprint:
+            return True
+        self._checked_at = clock.monotonic()
+        return False
+
+    def _ensure_loaded(self):
+        version = self._current_version()
+        if self._items is not None and self._version == version and not self._database_changed():
+            return
+        loads = self.loads
+        with self._lock:
+            if self.loads != loads:
+                return  # another thread reloaded while we waited
+            items = list(FoodItem.objects.order_by("id"))
+            by_name = {}
+            for food_item in items:
+                by_name.setdefault(normalize_food_name(food_item.name), food_item)
+            self._by_name = by_name
+            self._by_id = {food_item.id: food_item for food_item in items}
+            self._items = items
+            self._derived = {}
+            self._version = version
+            self._load_id = uuid4().hex
+            self._fingerprint = (
+                len(items),
+                items[-1].id if items else None,
+                max((food_item.updated_at for food_item in items), default=None),
+            )
+            self._checked_at = clock.monotonic()
+            self.loads += 1
+
+    def version(self):
+        """Identifies the loaded copy (and its derived structures); changes on every reload."""
+        self._ensure_loaded()
+        return self._load_id
+
+    def get(self, name):
+        """Returns the FoodItem matching `name` (case-insensitive) or None."""
+        return self.get_many([name]).get(normalize_food_name(name))
+
+    def get_many(self, names):
+        """Returns a dict of normalised name -> FoodItem for every name that exists."""
+        self._ensure_loaded()
+        found = {}
+        for name in names:
+            key = normalize_food_name(name)
+            food_item = self._by_name.get(key)
+            if food_item is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                found[key] = food_item
+        return found
+
+    def get_by_id(self, food_id):
+        self._ensure_loaded()
+        return self._by_id.get(food_id)
+
+    def all(self):
+        self._ensure_loaded()
+        return list(self._items)
+
+    def _derived_structure(self, name, builder):
+        """
+        Returns a structure derived from the current catalog (search index,
+        nutrient matrix, ...), building it with `builder(items)` on first use.
+        Derived structures are dropped together with the catalog on reload.
+        """
+        self._ensure_loaded()
+        structure = self._derived.get(name)
+        if structure is None:
+            with self._lock:
+                structure = self._derived.get(name)
+                if structure is None:
+                    structure = self._derived[name] = builder(self._items)
+        return structure
+
+    def search_index(self):
+        """Returns the FoodSearchIndex for the current catalog."""
+        from .search import FoodSearchIndex
+
+        return self._derived_structure("search_index", FoodSearchIndex)
+
+    def nutrient_engine(self):
+        """Returns the NutrientEngine (packed nutrient matrix) for the current catalog."""
+        from .nutrients import NutrientEngine
+
+        return self._derived_structure("nutrient_engine", NutrientEngine)
+
+    def recommendation_index(self):
+        """Returns the RecommendationIndex (candidate sets per diet/condition/goal) for the current catalog."""
+        from .recommendations import RecommendationIndex
+
+        return self._derived_structure("recommendation_index", RecommendationIndex)
+
+    def invalidate(self):
+        """Bumps the shared version so every worker drops its copy on next access."""
+        cache.set(CATALOG_VERSION_KEY, uuid4().hex, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "items": len(self._items or ()),
+        }
+
+
+food_catalog = FoodCatalog()
+
+
+def warm_food_catalog():
+    """
+    Loads the catalog and builds the search and recommendation indexes, so a
+    new worker does not build them on its first request. Called by
+    project/wsgi.py and project/asgi.py. Without a usable database (not
+    migrated yet) the first request builds them instead.
+    """
+    try:
+        food_catalog.search_index()
+        food_catalog.recommendation_index()
+        food_catalog.nutrient_engine()
+    except DatabaseError:
+        pass
+    finally:
+        # Requests open their own connections; don't keep (or fork) this one
+        connections.close_all()
@@ -0,0 +1,158 @@
+import asyncio
+import time as clock
+from datetime import timedelta
+from threading import Thread
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Q
+from django.utils.timezone import localdate
+
+from .models import User, UserMeal, UserProfile
+from .rollups import day_bounds
+from .routers import replica_reads
+
+OWNER_METRICS_CACHE_KEY = "dashboard:owner-metrics"
+OWNER_METRICS_LOCK_KEY = "dashboard:owner-metrics:refreshing"
+# Metrics younger than this are served as-is; older ones are still served
+# but trigger a background refresh.
+OWNER_METRICS_FRESH_SECONDS = 60
+# How long a computed result may be served at all.
+OWNER_METRICS_MAX_AGE = 60 * 60
+# Revenue estimate per active patient (₹)
+REVENUE_PER_ACTIVE_PATIENT = 49
+# Dummy promotion placeholder shown on the owner dashboard
+OWNER_PROMOTIONS = [
+    {"campaign": "Instagram Ad", "reach": "10k+", "status": "Running"},
+    {"campaign": "Referral Program", "reach": "5k+", "status": "Ended"},
+]
+
+
+def _owner_metric_queries(today):
+    """
+    The three owner dashboard queries, unevaluated: (queryset, aggregates) for
+    patients and for the last month of meals, and the country breakdown.
+    """
+    week_ago = today - timedelta(days=7)
+    month_ago = today - timedelta(days=30)
+    week_start = day_bounds(week_ago)[0]
+    month_start = day_bounds(month_ago)[0]
+
+    user_stats = User.objects.filter(role="user"), dict(
+        total_users=Count("id"),
+        new_users_week=Count("id", filter=Q(date_joined__gte=week_start)),
+        new_users_month=Count("id", filter=Q(date_joined__gte=month_start)),
+    )
+    usage = UserMeal.objects.filter(date__gte=month_ago), dict(
+        active_patients_week=Count("user", distinct=True, filter=Q(date__gte=week_ago)),
+        meals_logged_week=Count("id", filter=Q(date__gte=week_ago)),
+        meals_logged_month=Count("id"),
+    )
+    users_by_country = (
+        UserProfile.objects.values("country")
+        .annotate(user_count=Count("id"))
+        .order_by("-user_count")
+    )
+    return user_stats, usage, users_by_country
+
+
+def _owner_metrics(today, user_stats, usage, users_by_country):
+    return {
+        "date": str(today),
+        "user_stats": {
+            **user_stats,
+            "active_patients_week": usage["active_patients_week"],
+        },
+        "usage": {
+            "meals_logged_week": usage["meals_logged_week"],
+            "meals_logged_month": usage["meals_logged_month"],
+        },
+        "revenue": f"₹{usage['active_patients_week'] * REVENUE_PER_ACTIVE_PATIENT}",
+        "users_by_country": users_by_country,
+    }
+
+
+def compute_owner_metrics(today=None):
+    """
+    Computes the owner dashboard numbers with three queries: one conditional
+    aggregate over patients, one over the last month of meals, and the
+    country breakdown. Reads go to the replica when there is one.
+    """
+    today = today or localdate()
+    (users, user_aggregates), (meals, meal_aggregates), users_by_country = _owner_metric_queries(today)
+    with replica_reads():
+        return _owner_metrics(
+            today,
+            users.aggregate(**user_aggregates),
+            meals.aggregate(**meal_aggregates),
+            list(users_by_country),
+        )
+
+
+async def acompute_owner_metrics(today=None):
+    """compute_owner_metrics() on the async ORM, with the three queries awaited together."""
+    today = today or localdate()
+    (users, user_aggregates), (meals, meal_aggregates), users_by_country = _owner_metric_queries(today)
+
+    async def country_rows():
+        return [row async for row in users_by_country]
+
+    with replica_reads():
+        user_stats, usage, countries = await asyncio.gather(
+            users.aaggregate(**user_aggregates),
+            meals.aaggregate(**meal_aggregates),
+            country_rows(),
+        )
+    return _owner_metrics(today, user_stats, usage, countries)
+
+
+def refresh_owner_metrics():
+    metrics = compute_owner_metrics()
+    cache.set(
+        OWNER_METRICS_CACHE_KEY,
+        {"metrics": metrics, "computed_at": clock.time()},
+        OWNER_METRICS_MAX_AGE,
+    )
+    return metrics
+
+
+def _refresh_in_background():
+    try:
+        refresh_owner_metrics()
+    finally:
+        cache.delete(OWNER_METRICS_LOCK_KEY)
+        connections.close_all()
+
+
+def get_owner_metrics():
+    """
+    Returns cached owner metrics. Stale results are served immediately while a
+    single background thread (guarded by a cache lock) recomputes them, so only
+    a cold cache makes the caller wait for the queries.
+    """
+    entry = cache.get(OWNER_METRICS_CACHE_KEY)
+    if entry is None:
+        return refresh_owner_metrics()
+
+    if clock.time() - entry["computed_at"] > OWNER_METRICS_FRESH_SECONDS:
+        if cache.add(OWNER_METRICS_LOCK_KEY, True, OWNER_METRICS_FRESH_SECONDS):
+            Thread(target=_refresh_in_background, daemon=True).start()
+    return entry["metrics"]
+
+
+async def aget_owner_metrics():
+    """Async version of get_owner_metrics(); a stale entry is refreshed in the same background thread."""
+    entry = await cache.aget(OWNER_METRICS_CACHE_KEY)
+    if entry is None:
+        metrics = await acompute_owner_metrics()
+        await cache.aset(
+            OWNER_METRICS_CACHE_KEY,
+            {"metrics": metrics, "computed_at": clock.time()},
+            OWNER_METRICS_MAX_AGE,
+        )
+        return metrics
+
+    if clock.time() - entry["computed_at"] > OWNER_METRICS_FRESH_SECONDS:
+        if await cache.aadd(OWNER_METRICS_LOCK_KEY, True, OWNER_METRICS_FRESH_SECONDS):
+            Thread(target=_refresh_in_background, daemon=True).start()
+    return entry["metrics"]
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from app.authentication import ClaimsTokenObtainPairSerializer
+from app.models import User
+
+# Endpoint -> (sync URL name, async URL name)
+ENDPOINTS = {
+    "summary": ("daily_calorie_summary", "async-daily-calorie-summary"),
+    "recommend": ("recommend_calories", "async-recommend-calories"),
+    "owner": ("owner-dashboard", "async-owner-dashboard"),
+    "operator": ("operator-report", "async-operator-report"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests an endpoint through the sync (WSGI) handler and its /api/async/ twin "
+        "through the ASGI handler, in-process, at the same concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("endpoint", choices=sorted(ENDPOINTS))
+        parser.add_argument("--email", required=True, help="User to authenticate as (needs the endpoint's role).")
+        parser.add_argument("--requests", type=int, default=1_000, help="Requests per path.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['email']!r}.")
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        headers = {"Authorization": f"Bearer {token}"}
+        sync_name, async_name = ENDPOINTS[options["endpoint"]]
+        count, concurrency = options["requests"], options["concurrency"]
+
+        self.report("sync (WSGI)", *self.run_sync(reverse(sync_name), headers, count, concurrency))
+        self.report("async (ASGI)", *asyncio.run(self.run_async(reverse(async_name), headers, count, concurrency)))
+
+    def run_sync(self, url, headers, count, concurrency):
+        def fetch(_):
+            started = time.perf_counter()
+            response = Client(headers=headers).get(url)
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(fetch, range(count)))
+        return time.perf_counter() - started, results
+
+    async def run_async(self, url, headers, count, concurrency):
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch() for _ in range(count)))
+        return time.perf_counter() - started, results
+
+    def report(self, label, elapsed, results):
+        timings = sorted(seconds for seconds, _ in results)
+        errors = sum(1 for _, status in results if status >= 400)
+
+        def ms(seconds):
+            return f"{seconds * 1000:.2f} ms"
+
+        self.stdout.write(
+            f"{label:<13} {len(results) / elapsed:8.1f} req/s   "
+            f"p50 {ms(timings[len(timings) // 2])}   p99 {ms(timings[int(len(timings) * 0.99)])}   "
+            f"errors {errors}"
+        )
@@ -0,0 +1,88 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.models import FoodItem
+from app.search import FoodSearchIndex
+
+QUERY_KINDS = ("prefix", "name typo", "word typo")
+
+
+def with_typo(rng, text):
+    position = rng.randrange(len(text))
+    return text[:position] + rng.choice(string.ascii_lowercase) + text[position + 1:]
+
+
+class Command(BaseCommand):
+    help = "Benchmarks FoodSearchIndex lookups on a synthetic in-memory catalog (nothing is written to the database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=100_000, help="Number of synthetic food items.")
+        parser.add_argument("--queries", type=int, default=5_000, help="Number of lookups to time.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(5_000)]
+        food_types = [choice for choice, _ in FoodItem.FOOD_TYPE_CHOICES]
+
+        items = [
+            FoodItem(
+                id=i,
+                name=" ".join(rng.sample(words, rng.randint(1, 3))).title(),
+                calories=0, protein_g=0, carbs_g=0, fats_g=0, sugar_g=0, fiber_g=0,
+                food_type=rng.choice(food_types),
+            )
+            for i in range(options["items"])
+        ]
+
+        started = time.perf_counter()
+        index = FoodSearchIndex(items)
+        build_seconds = time.perf_counter() - started
+
+        # (kind, query, check that the results contain what the user meant)
+        queries = []
+        for _ in range(options["queries"]):
+            item = rng.choice(items)
+            name = item.name.lower()
+            kind = rng.choice(QUERY_KINDS)
+            if kind == "prefix":
+                query, found = name[: rng.randint(2, len(name))], None  # autocomplete
+            elif kind == "name typo":
+                query = with_typo(rng, name)
+                found = lambda results, item=item: any(result is item for result, _ in results)
+            else:
+                # One misspelt word; any name containing the intended word is a hit
+                word = rng.choice(name.split())
+                query = with_typo(rng, word)
+                found = lambda results, word=word: any(word in result.name.lower().split() for result, _ in results)
+            queries.append((kind, query, found))
+
+        timings = {kind: [] for kind in QUERY_KINDS}
+        hits = dict.fromkeys(QUERY_KINDS, 0)
+        for kind, query, found in queries:
+            started = time.perf_counter()
+            results = index.search(query, limit=10)
+            timings[kind].append(time.perf_counter() - started)
+            if found is not None:
+                hits[kind] += found(results)
+
+        def ms(seconds):
+            return f"{seconds * 1000:.3f} ms"
+
+        def summary(label, values, found=None):
+            values = sorted(values)
+            line = (
+                f"{label:<12} {len(values):>6} lookups   mean {ms(sum(values) / len(values))}   "
+                f"p50 {ms(values[len(values) // 2])}   p99 {ms(values[int(len(values) * 0.99)])}"
+            )
+            if found is not None:
+                line += f"   found in top 10: {found / len(values):.1%}"
+            self.stdout.write(line)
+
+        self.stdout.write(f"Catalog size:  {len(index)} items (index built in {build_seconds:.2f} s)")
+        for kind in QUERY_KINDS:
+            summary(kind, timings[kind], None if kind == "prefix" else hits[kind])
+        summary("all", [seconds for values in timings.values() for seconds in values])
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.reminders import REMINDER_BATCH_SIZE, dispatch_queued, queue_due_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Queues reminders whose date has passed and sends every queued reminder in "
+        "batches over one mail connection. With --loop it keeps polling, and several "
+        "workers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REMINDER_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for due reminders.")
+        parser.add_argument("--interval", type=float, default=10, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            due = queue_due_reminders()
+            totals = dispatch_queued(batch_size=options["batch_size"])
+            if due or totals["sent"] or totals["failed"] or not options["loop"]:
+                self.stdout.write(
+                    f"{due} reminder(s) came due. Sent {totals['sent']}, {totals['failed']} failed."
+                )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,36 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import localdate
+
+from app.models import AppReport
+from app.reports import generate_reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes daily AppReport snapshots. By default continues from the latest "
+        "snapshot up to yesterday; use --since/--until to backfill or rebuild a range."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day to (re)generate (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Last day to (re)generate (YYYY-MM-DD, default: yesterday).")
+
+    def handle(self, *args, **options):
+        try:
+            end = date.fromisoformat(options["until"]) if options["until"] else localdate() - timedelta(days=1)
+            start = date.fromisoformat(options["since"]) if options["since"] else None
+        except ValueError as error:
+            raise CommandError(f"Invalid date: {error}")
+
+        if start is None:
+            latest = AppReport.objects.order_by("-report_date").values_list("report_date", flat=True).first()
+            start = latest + timedelta(days=1) if latest else end
+
+        if start > end:
+            self.stdout.write("Reports are already up to date.")
+            return
+
+        reports = generate_reports(start, end)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(reports)} report(s) from {start} to {end}."))
@@ -0,0 +1,146 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
+
+from app.caching import invalidate_responses
+from app.catalog import food_catalog, normalize_food_name
+from app.models import FoodItem
+
+DEFAULT_DATASET = os.path.join(settings.BASE_DIR, "app", "dataset", "indian_food_items.csv")
+
+NUMERIC_FIELDS = ["calories", "protein_g", "carbs_g", "fats_g", "sugar_g", "fiber_g"]
+# choice field -> (allowed values, default)
+CHOICE_FIELDS = {
+    field: ({value for value, _ in choices}, FoodItem._meta.get_field(field).default)
+    for field, choices in [
+        ("food_type", FoodItem.FOOD_TYPE_CHOICES),
+        ("suitable_for_conditions", FoodItem.HEALTH_CONDITION_CHOICES),
+        ("suitable_for_goal", FoodItem.GOAL_CHOICES),
+    ]
+}
+UPDATE_FIELDS = NUMERIC_FIELDS + ["glycemic_index"] + list(CHOICE_FIELDS) + ["updated_at"]
+NAME_MAX_LENGTH = FoodItem._meta.get_field("name").max_length
+
+
+def read_rows(path, file_format):
+    """
+    Yields (line_number, row) from a CSV or JSONL file without loading it into
+    memory: a dict per CSV row, the raw line for JSONL (decoded by load_row()).
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                yield line_number, row
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+def load_row(row):
+    """Returns a row as a dict, decoding JSONL lines. Raises ValueError for bad data."""
+    if isinstance(row, str):
+        row = json.loads(row)  # JSONDecodeError is a ValueError
+    if not isinstance(row, dict):
+        raise ValueError(f"expected a JSON object, got {type(row).__name__}")
+    return row
+
+
+def build_food_item(row):
+    """Converts one row dict into an unsaved FoodItem. Raises ValueError for bad data."""
+    name = " ".join(str(row.get("name") or "").split())
+    if not name:
+        raise ValueError("name is required")
+    if len(name) > NAME_MAX_LENGTH:
+        raise ValueError(f"name '{name[:20]}...' is too long")
+
+    values = {field: float(row[field]) for field in NUMERIC_FIELDS}
+    glycemic_index = row.get("glycemic_index")
+    values["glycemic_index"] = float(glycemic_index) if glycemic_index not in (None, "") else None
+
+    for field, (allowed, default) in CHOICE_FIELDS.items():
+        value = row.get(field) or default
+        if value not in allowed:
+            raise ValueError(f"invalid {field} '{value}'")
+        values[field] = value
+
+    return FoodItem(name=name, **values)
+
+
+class Command(BaseCommand):
+    help = "Streams FoodItem rows from a CSV or JSONL file and upserts them by name in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default=DEFAULT_DATASET, help="CSV or JSONL file (default: bundled Indian food dataset).")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="File format (default: guessed from the extension).")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per bulk upsert.")
+        parser.add_argument("--dry-run", action="store_true", help="Parse and validate only, write nothing.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        file_format = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        started = time.perf_counter()
+        total = imported = skipped = 0
+        rows = read_rows(path, file_format)
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            total += len(chunk)
+
+            # Later rows win when a name repeats inside the chunk (in any case)
+            foods = {}
+            for line_number, row in chunk:
+                try:
+                    food_item = build_food_item(load_row(row))
+                except (KeyError, TypeError, ValueError) as error:
+                    skipped += 1
+                    self.stderr.write(f"Line {line_number}: skipped ({error!r})")
+                    continue
+                foods[normalize_food_name(food_item.name)] = food_item
+
+            if foods and not options["dry_run"]:
+                # Names are unique regardless of case: keep the stored spelling
+                # so "poha" updates "Poha" instead of conflicting with it
+                existing = (
+                    FoodItem.objects.annotate(name_lower=Lower("name"))
+                    .filter(name_lower__in=list(foods))
+                    .values_list("name_lower", "name")
+                )
+                for name_lower, name in existing:
+                    foods[name_lower].name = name
+                FoodItem.objects.bulk_create(
+                    foods.values(),
+                    update_conflicts=True,
+                    unique_fields=["name"],
+                    update_fields=UPDATE_FIELDS,
+                )
+            imported += len(foods)
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{total} rows read, {imported} upserted ({total / elapsed:,.0f} rows/sec)")
+
+        if imported and not options["dry_run"]:
+            # bulk_create does not send post_save, so drop cached catalogs explicitly
+            food_catalog.invalidate()
+            invalidate_responses("foods")
+
+        elapsed = time.perf_counter() - started
+        verb = "validated" if options["dry_run"] else "imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{imported} food items {verb}, {skipped} skipped, {total} rows in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else total:,.0f} rows/sec)"
+        ))
@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.rollups import backfill_glycemic_load, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuilds DailyNutritionSummary rows from UserMeal (for backfills or after bulk data fixes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="user_ids", help="Only rebuild this user id (repeatable).")
+        parser.add_argument("--since", help="First date to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Last date to rebuild (YYYY-MM-DD).")
+        parser.add_argument(
+            "--backfill-glycemic-load",
+            action="store_true",
+            help="First fill glycemic_load on meals logged before it was stored.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["since"]) if options["since"] else None
+            end = date.fromisoformat(options["until"]) if options["until"] else None
+        except ValueError as error:
+            raise CommandError(f"Invalid date: {error}")
+
+        if options["backfill_glycemic_load"]:
+            filled = backfill_glycemic_load()
+            self.stdout.write(f"Filled glycemic load on {filled} meals.")
+
+        written = rebuild_summaries(user_ids=options["user_ids"], start=start, end=end)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} daily nutrition summaries."))
@@ -0,0 +1,251 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.backends.signals import connection_created
+
+# Upper bounds of the histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self):
+        observed = sum(self.counts)
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "mean": round(self.total / observed, 2) if observed else None,
+            "max": round(self.max, 2),
+        }
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.wall_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.db_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.serializer_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.render_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.response_bytes = 0
+
+    def snapshot(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "wall_ms": self.wall_ms.snapshot(),
+            "db_ms": self.db_ms.snapshot(),
+            "serializer_ms": self.serializer_ms.snapshot(),
+            "render_ms": self.render_ms.snapshot(),
+            "queries": self.queries.snapshot(),
+            "avg_response_bytes": round(self.response_bytes / self.requests) if self.requests else None,
+        }
+
+
+class RequestMetricsRegistry:
+    """Process-local per-view histograms, read by the operator metrics endpoint."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._views = {}
+
+    def record(self, view_name, wall_ms, db_ms, serializer_ms, render_ms, queries, status_code, size):
+        with self._lock:
+            metrics = self._views.get(view_name)
+            if metrics is None:
+                metrics = self._views[view_name] = ViewMetrics()
+            metrics.requests += 1
+            metrics.errors += status_code >= 500
+            metrics.wall_ms.observe(wall_ms)
+            metrics.db_ms.observe(db_ms)
+            metrics.serializer_ms.observe(serializer_ms)
+            metrics.render_ms.observe(render_ms)
+            metrics.queries.observe(queries)
+            metrics.response_bytes += size or 0
+
+    def snapshot(self):
+        with self._lock:
+            return {name: metrics.snapshot() for name, metrics in sorted(self._views.items())}
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+
+request_metrics = RequestMetricsRegistry()
+
+
+class QueryTimer:
+    """Execute wrapper that counts queries and sums their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestTimings:
+    """What one request spent in the database, its serializers and rendering."""
+
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.serializer_seconds = 0.0
+        self.render_seconds = 0.0
+        self.serializing = False
+
+
+# Timings of the request being handled. A context variable rather than a
+# per-connection wrapper set up by the middleware: database connections are
+# per thread, and the async ORM runs its queries in another thread than the
+# async view, which sync_to_async() carries the context variable into.
+_current_timings = ContextVar("request_timings", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.queries(execute, sql, params, many, context)
+
+
+def _add_query_timer(sender, connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+class TimedRepresentationMixin:
+    """
+    Serializer mixin that adds its to_representation() time to the request's
+    serializer time. Used by the app's model serializers (app/serializers.py);
+    for many=True, ListSerializer calls each item's to_representation().
+    """
+
+    def to_representation(self, instance):
+        timings = _current_timings.get()
+        # Nested serializers are part of the outer serializer's time
+        if timings is None or timings.serializing:
+            return super().to_representation(instance)
+        timings.serializing = True
+        db_seconds = timings.queries.seconds
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            # Queries made by the serializer (lazy relations) stay in db time
+            timings.serializer_seconds += time.perf_counter() - started - (timings.queries.seconds - db_seconds)
+            timings.serializing = False
+
+
+def install_request_timing():
+    """
+    Gives every database connection a query timer (execute wrapper) when it
+    connects, on every alias and in every thread; it only records while
+    RequestMetricsMiddleware measures a request. Called from AppConfig.ready().
+    """
+    connection_created.connect(_add_query_timer, dispatch_uid="request-metrics-query-timer")
+
+
+class RequestMetricsMiddleware:
+    """
+    Records, for every request: view name, wall time, query count and time
+    (on every database alias), serializer time (serializers using
+    TimedRepresentationMixin), JSON/template render time and response size.
+    - Adds a Server-Timing header (total, db, serializer, render, app) that
+      browser dev tools and most APM agents display.
+    - Feeds request_metrics, served at /api/operator/metrics/, so N+1 views
+      stand out by their query count histogram.
+    Works under WSGI and ASGI without forcing async views into a thread.
+    Streamed bodies (CSV/NDJSON exports) are produced after the middleware
+    returns and are not included.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with self.measure(request) as timings:
+            response = self.get_response(request)
+        return self.finish(request, response, timings, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with self.measure(request) as timings:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, time.perf_counter() - started)
+
+    @contextmanager
+    def measure(self, request):
+        timings = request._request_timings = RequestTimings()
+        token = _current_timings.set(timings)
+        try:
+            yield timings
+        finally:
+            _current_timings.reset(token)
+
+    def finish(self, request, response, timings, wall):
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else "unresolved"  # the URL name, else the view's dotted path
+        size = None if response.streaming else len(response.content)
+        db = timings.queries.seconds
+        serializer = timings.serializer_seconds
+        render = timings.render_seconds
+
+        response["Server-Timing"] = ", ".join([
+            f"total;dur={wall * 1000:.1f}",
+            f'db;dur={db * 1000:.1f};desc="{timings.queries.count} queries"',
+            f"serializer;dur={serializer * 1000:.1f}",
+            f"render;dur={render * 1000:.1f}",
+            f"app;dur={max(wall - db - serializer - render, 0) * 1000:.1f}",
+        ])
+        request_metrics.record(
+            view_name,
+            wall_ms=wall * 1000,
+            db_ms=db * 1000,
+            serializer_ms=serializer * 1000,
+            render_ms=render * 1000,
+            queries=timings.queries.count,
+            status_code=response.status_code,
+            size=size,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # Called just before DRF/template responses are rendered; time the render
+        render_started = time.perf_counter()
+        timings = request._request_timings
+
+        def record_render_time(rendered):
+            timings.render_seconds = time.perf_counter() - render_started
+
+        response.add_post_render_callback(record_render_time)
+        return response
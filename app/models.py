@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.utils import timezone
 from django.utils.timezone import now
@@ -38,6 +39,12 @@ class User(AbstractBaseUser):
     objects = UserManager()
     USERNAME_FIELD = 'email'
 
+    class Meta:
+        indexes = [
+            # Dashboard counts of patients, total and joined since a date
+            models.Index(fields=["role", "date_joined"], name="user_role_joined_idx"),
+        ]
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
@@ -131,7 +138,7 @@ class FoodItem(models.Model):
         ("gain_weight", "Gain Weight"),
     ]
 
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, unique=True)
     calories = models.FloatField()
     protein_g = models.FloatField()
     carbs_g = models.FloatField()
@@ -143,6 +150,14 @@ class FoodItem(models.Model):
     food_type = models.CharField(max_length=20, choices=FOOD_TYPE_CHOICES, default="other")
     suitable_for_conditions = models.CharField(max_length=50, choices=HEALTH_CONDITION_CHOICES, default="none")
     suitable_for_goal = models.CharField(max_length=20, choices=GOAL_CHOICES, default="maintain")
+    # Part of the catalog fingerprint workers poll for changes (see app/catalog.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            # Names are looked up case-insensitively (catalog, search, meal logging)
+            models.UniqueConstraint(Lower("name"), name="fooditem_name_ci_unique"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.food_type})"
@@ -182,9 +197,20 @@ class UserMeal(models.Model):
     fats = models.FloatField(blank=True, null=True)
     sugar = models.FloatField(blank=True, null=True)
     fiber = models.FloatField(blank=True, null=True)
+    # GI x carbs / 100, set when the meal is logged (None if the food has no GI)
+    glycemic_load = models.FloatField(blank=True, null=True)
 
     date = models.DateField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Per-user history and day ranges (meal list, rollup rebuilds, summaries)
+            models.Index(fields=["user", "consumed_at"], name="usermeal_user_consumed_idx"),
+            # Owner dashboard: meals logged / distinct active users since a date,
+            # answerable from the index alone
+            models.Index(fields=["date", "user"], name="usermeal_date_user_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.food_name and self.food_item:
             self.food_name = self.food_item.name
@@ -193,10 +219,48 @@ class UserMeal(models.Model):
     def __str__(self):
         return f"{self.user.email} ate {self.food_name or 'Unknown'} on {self.consumed_at.date()} — {self.quantity} {self.unit}"
 
+# ------------------------
+# Daily Nutrition Rollup
+# ------------------------
+class DailyNutritionSummary(models.Model):
+    """
+    Per-user nutrient totals for one day, kept up to date as meals are logged,
+    edited or deleted (see app/rollups.py). Read by the summary and trend views
+    instead of aggregating UserMeal on every request.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_summaries")
+    date = models.DateField()
+
+    calories = models.FloatField(default=0)
+    protein = models.FloatField(default=0)
+    carbs = models.FloatField(default=0)
+    fats = models.FloatField(default=0)
+    sugar = models.FloatField(default=0)
+    fiber = models.FloatField(default=0)
+    glycemic_load = models.FloatField(default=0)
+    meal_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="unique_daily_summary_per_user"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} on {self.date}: {self.calories} kcal"
+
 # ------------------------# Nutritionist Profile
 class NutritionistProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, limit_choices_to={'role': 'nutritionist'})
     expert_level = models.PositiveSmallIntegerField(choices=[(1, 'Basic'), (2, 'Senior')], default=1)
+    patients = models.ManyToManyField(
+        User,
+        blank=True,
+        related_name="assigned_nutritionists",
+        limit_choices_to={'role': 'user'},
+        help_text="Patients this nutritionist looks after",
+    )
 
     def __str__(self):
         return f"{self.user.email} - Level {self.expert_level}"
@@ -205,10 +269,18 @@ class NutritionistProfile(models.Model):
 
 # ------------------------For OWNER/OPERATOR
 class AppReport(models.Model):
-    report_date = models.DateField(auto_now_add=True)
+    """
+    Daily snapshot of owner/operator numbers, written by the
+    `generate_app_reports` management command (see app/reports.py).
+    """
+    report_date = models.DateField(default=timezone.localdate, unique=True)
+    total_users = models.IntegerField(default=0)
     new_users = models.IntegerField()
     active_patients = models.IntegerField()
+    meals_logged = models.IntegerField(default=0)
     total_revenue = models.FloatField()
+    feedback_count = models.IntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
     feedback_summary = models.TextField(blank=True)
 
     def __str__(self):
@@ -218,12 +290,26 @@ class AppReport(models.Model):
 # ------------------------# Patient Reminders
 
 class PatientReminder(models.Model):
+    RECURRENCE_CHOICES = [
+        ("none", "Once"),
+        ("daily", "Daily"),
+        ("weekly", "Weekly"),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255, default="General Reminder")
     message = models.TextField(blank=True, default="No message provided.")
     created_at = models.DateTimeField(auto_now_add=True)  # No default here
     sent_at = models.DateTimeField(null=True, blank=True)
     date = models.DateTimeField(default=now)
+    # Dispatch queue state (see app/reminders.py)
+    queued_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # being sent by a worker since
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Recurring reminders: the next occurrence is created when this one is sent
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default="none")
+    repeat_until = models.DateTimeField(null=True, blank=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -231,6 +317,12 @@ class PatientReminder(models.Model):
         related_name="created_reminders"
     )
 
+    class Meta:
+        indexes = [
+            # Scheduler poll: unsent reminders that are due
+            models.Index(fields=["date"], condition=models.Q(sent_at__isnull=True), name="reminder_unsent_date_idx"),
+        ]
+
     def __str__(self):
         if self.user:
             return f"Reminder to {self.user.email} - {self.title}"
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+
+from utils.utils import UNIT_TO_GRAMS
+
+# UserMeal field -> FoodItem column (per 100 g), in matrix column order
+NUTRIENT_FIELDS = {
+    "calories": "calories",
+    "protein": "protein_g",
+    "carbs": "carbs_g",
+    "fats": "fats_g",
+    "sugar": "sugar_g",
+    "fiber": "fiber_g",
+}
+
+
+def glycemic_load(glycemic_index, carbs):
+    """Glycemic load of a portion: GI x available carbohydrate (g) / 100. None without a GI."""
+    if glycemic_index is None or carbs is None:
+        return None
+    return round(glycemic_index * carbs / 100, 2)
+
+
+def grams_for(quantity, unit):
+    """Converts a quantity in `unit` to grams, defaulting to 100 g per unknown unit."""
+    return quantity * UNIT_TO_GRAMS.get(unit.lower(), 100)
+
+
+class NutrientEngine:
+    """
+    Packs the food catalog into a (foods x nutrients) matrix of per-100 g values
+    so a whole batch of meals is scaled with one vectorised multiplication.
+    Built once per catalog version by FoodCatalog.nutrient_engine().
+    """
+
+    fields = tuple(NUTRIENT_FIELDS)
+
+    def __init__(self, food_items):
+        food_items = list(food_items)
+        self._row_for_id = {food_item.id: row for row, food_item in enumerate(food_items)}
+        self.matrix = np.array(
+            [[getattr(food_item, column) for column in NUTRIENT_FIELDS.values()] for food_item in food_items],
+            dtype=np.float64,
+        ).reshape(len(food_items), len(NUTRIENT_FIELDS))
+        # Per-food glycemic index, NaN where the food has none
+        self.glycemic_index = np.array(
+            [np.nan if food_item.glycemic_index is None else food_item.glycemic_index for food_item in food_items],
+            dtype=np.float64,
+        )
+
+    def scale(self, rows):
+        """
+        Takes an iterable of (food_id, quantity, unit) and returns an (n x 6)
+        array of unrounded nutrient amounts, columns ordered as `fields`.
+        Raises KeyError for a food id that is not in the catalog.
+        """
+        rows = list(rows)
+        if not rows:
+            return np.empty((0, len(self.fields)))
+        indexes = np.fromiter((self._row_for_id[food_id] for food_id, _, _ in rows), dtype=np.intp, count=len(rows))
+        grams = np.fromiter((grams_for(quantity, unit) for _, quantity, unit in rows), dtype=np.float64, count=len(rows))
+        return self.matrix[indexes] * (grams / 100)[:, np.newaxis]
+
+    def glycemic_loads(self, rows, carbs):
+        """
+        Glycemic load per row from the scaled `carbs` column of scale(rows);
+        NaN for foods without a glycemic index.
+        """
+        indexes = np.fromiter((self._row_for_id[food_id] for food_id, _, _ in rows), dtype=np.intp, count=len(rows))
+        return self.glycemic_index[indexes] * carbs / 100
+
+    def compute(self, rows):
+        """
+        Same as scale() but returns one {field: value} dict per row, rounded to
+        two decimals exactly like the original per-field code did, plus the
+        meal's glycemic_load (None when the food has no glycemic index).
+        """
+        rows = list(rows)
+        scaled = self.scale(rows)
+        loads = self.glycemic_loads(rows, scaled[:, self.fields.index("carbs")])
+        return [
+            {
+                **{field: round(value, 2) for field, value in zip(self.fields, values)},
+                "glycemic_load": None if math.isnan(load) else round(load, 2),
+            }
+            for values, load in zip(scaled.tolist(), loads.tolist())
+        ]
@@ -0,0 +1,45 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class ContactCursorPagination(CursorPagination):
+    """Keyset pagination on id for the operator contact list."""
+    ordering = "id"
+    page_size = 500
+    page_size_query_param = "page_size"
+    max_page_size = 5000
+
+
+class ReminderCursorPagination(CursorPagination):
+    """Newest reminders first, keyset on id."""
+    ordering = "-id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class PatientCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the nutritionist dashboard. Keeps the original
+    "patients" key for the page contents.
+    """
+    ordering = "id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        # ?ordering= allows non-unique fields (name, age, ...); without a final
+        # id the order of ties is undefined and rows can repeat or go missing
+        # between pages
+        ordering = super().get_ordering(request, queryset, view)
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering += ("id",)
+        return ordering
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "patients": data,
+        })
@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from .catalog import food_catalog
+from .models import DailyNutritionSummary, FoodItem, UserProfile
+from .targets import get_calorie_target
+
+# Foods each diet may eat, by FoodItem.food_type
+DIET_FOOD_TYPES = {
+    "vegan": ("vegan",),
+    "vegetarian": ("vegetarian", "vegan"),
+    "eggetarian": ("eggetarian", "vegetarian", "vegan"),
+    "non_vegetarian": None,  # anything
+    "other": None,
+}
+# UserProfile.goal -> FoodItem.suitable_for_goal
+GOAL_TO_FOOD_GOAL = {
+    "lose_weight": "weight_loss",
+    "maintain": "maintain",
+    "gain_weight": "gain_weight",
+}
+# Share of daily calories from protein/carbs/fats, and kcal per gram of each
+MACRO_SPLIT = {
+    "none": (0.20, 0.50, 0.30),
+    "diabetes": (0.25, 0.40, 0.35),
+}
+KCAL_PER_GRAM = np.array([4.0, 4.0, 9.0])
+
+# Portions are sized to fill a third of the daily target, within these bounds
+MIN_PORTION_G = 50
+MAX_PORTION_G = 400
+MIN_MEAL_BUDGET = 150
+GOAL_BONUS = 0.25
+# Score lost per unit of portion glycemic load for diabetic users
+GLYCEMIC_LOAD_PENALTY = 0.02
+# Results kept per cached entry; requests slice their `limit` from these
+MAX_RECOMMENDATIONS = 50
+RECOMMENDATION_CACHE_SIZE = 10_000
+
+
+def condition_for(profile):
+    """The FoodItem condition a profile is matched against ("none" unless one applies)."""
+    if profile["diabeticprofile__id"] is not None:
+        return "diabetes"
+    conditions = (profile["health_conditions"] or "").lower()
+    for condition, _ in FoodItem.HEALTH_CONDITION_CHOICES:
+        if condition != "none" and condition in conditions:
+            return condition
+    return "none"
+
+
+class CandidateSet:
+    """The foods one (diet type, condition, goal) combination may be recommended."""
+
+    def __init__(self, positions, macros, glycemic_index, goal_match):
+        self.positions = positions
+        self.macros = macros  # per 100 g: calories, protein, carbs, fats
+        self.glycemic_index = glycemic_index
+        self.goal_match = goal_match
+
+
+class RecommendationIndex:
+    """
+    Candidate foods for every (diet type, condition, goal) combination, with
+    their per-100 g macros packed in numpy arrays so a user's whole candidate
+    set is scored in one pass.
+    Built once per catalog version by FoodCatalog.recommendation_index().
+    """
+
+    def __init__(self, food_items):
+        self._items = list(food_items)
+        count = len(self._items)
+        macros = np.array(
+            [[item.calories, item.protein_g, item.carbs_g, item.fats_g] for item in self._items],
+            dtype=np.float64,
+        ).reshape(count, 4)
+        glycemic_index = np.array(
+            [np.nan if item.glycemic_index is None else item.glycemic_index for item in self._items],
+            dtype=np.float64,
+        )
+        food_types = np.array([item.food_type for item in self._items], dtype=object)
+        conditions = np.array([item.suitable_for_conditions for item in self._items], dtype=object)
+        goals = np.array([item.suitable_for_goal for item in self._items], dtype=object)
+
+        self._candidates = {}
+        for diet, allowed_types in DIET_FOOD_TYPES.items():
+            diet_mask = np.ones(count, dtype=bool) if allowed_types is None else np.isin(food_types, allowed_types)
+            for condition, _ in FoodItem.HEALTH_CONDITION_CHOICES:
+                # Foods for a condition suit everyone; general foods suit every condition
+                mask = diet_mask if condition == "none" else diet_mask & np.isin(conditions, (condition, "none"))
+                positions = np.flatnonzero(mask & (macros[:, 0] > 0))
+                for goal in GOAL_TO_FOOD_GOAL.values():
+                    self._candidates[(diet, condition, goal)] = CandidateSet(
+                        positions, macros[positions], glycemic_index[positions], goals[positions] == goal
+                    )
+
+    def candidates(self, diet, condition, goal):
+        return self._candidates.get((diet, condition, goal)) or self._candidates[("other", condition, goal)]
+
+    def recommend(self, diet, condition, goal, remaining, daily_target, limit=MAX_RECOMMENDATIONS):
+        """
+        Scores the candidates of a combination against the remaining
+        (calories, protein, carbs, fats) of the day and returns the top `limit`.
+        - Each food gets a portion sized to a third of the daily target (or what
+          is left of the day, if less), within MIN/MAX_PORTION_G.
+        - Score = cosine similarity between the portion's macros and the
+          remaining macros, minus the share of the portion that overshoots them,
+          plus GOAL_BONUS for foods made for the user's goal (and minus a
+          glycemic load penalty for diabetic users).
+        """
+        candidates = self.candidates(diet, condition, goal)
+        if not len(candidates.positions):
+            return []
+        remaining = np.clip(np.asarray(remaining, dtype=np.float64), 0, None)
+
+        budget = max(min(remaining[0], daily_target / 3), MIN_MEAL_BUDGET)
+        portions = np.clip(budget / candidates.macros[:, 0] * 100, MIN_PORTION_G, MAX_PORTION_G)
+        portions = np.round(portions / 10) * 10
+        nutrients = candidates.macros * (portions / 100)[:, np.newaxis]
+
+        grams = nutrients[:, 1:]
+        wanted = remaining[1:]
+        norms = np.linalg.norm(grams, axis=1) * np.linalg.norm(wanted)
+        similarity = np.divide(grams @ wanted, norms, out=np.zeros(len(grams)), where=norms > 0)
+        overshoot = np.clip(grams - wanted, 0, None).sum(axis=1) / np.maximum(grams.sum(axis=1), 1e-9)
+        scores = similarity - overshoot + GOAL_BONUS * candidates.goal_match
+
+        glycemic_loads = candidates.glycemic_index * nutrients[:, 2] / 100
+        if condition == "diabetes":
+            scores -= GLYCEMIC_LOAD_PENALTY * np.nan_to_num(glycemic_loads)
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for row in top.tolist():
+            food_item = self._items[candidates.positions[row]]
+            calories, protein, carbs, fats = nutrients[row].tolist()
+            glycemic_load = glycemic_loads[row]
+            results.append({
+                "food_id": food_item.id,
+                "name": food_item.name,
+                "food_type": food_item.food_type,
+                "suitable_for_goal": food_item.suitable_for_goal,
+                "portion_g": int(portions[row]),
+                "calories": round(calories, 2),
+                "protein": round(protein, 2),
+                "carbs": round(carbs, 2),
+                "fats": round(fats, 2),
+                "glycemic_load": None if np.isnan(glycemic_load) else round(float(glycemic_load), 2),
+                "score": round(float(scores[row]), 3),
+            })
+        return results
+
+
+class RecommendationCache:
+    """
+    Process-local LRU of recommendations per (user, day).
+    Entries remember the state they were computed from (daily totals, target,
+    profile, catalog version); a lookup with a different state is a miss, so an
+    entry is never served after a meal lands, even one logged on another worker.
+    forget() drops a user's entries right away when a meal is logged here.
+    """
+
+    def __init__(self, max_size=RECOMMENDATION_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, state):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != state:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, state, value):
+        with self._lock:
+            self._entries[key] = (state, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+recommendation_cache = RecommendationCache()
+
+
+def recommend_foods(user_id, day, limit=10):
+    """
+    Top `limit` food suggestions for the user's remaining macros on `day`.
+    Returns (remaining, suggestions). Raises UserProfile.DoesNotExist without a profile.
+    """
+    profile = (
+        UserProfile.objects.filter(user_id=user_id)
+        .values("diet_type", "goal", "health_conditions", "diabeticprofile__id")
+        .first()
+    )
+    if profile is None:
+        raise UserProfile.DoesNotExist
+    totals = (
+        DailyNutritionSummary.objects.filter(user_id=user_id, date=day)
+        .values_list("calories", "protein", "carbs", "fats")
+        .first()
+    ) or (0, 0, 0, 0)
+
+    daily_target = get_calorie_target(user_id)["recommended_calories"]
+    condition = condition_for(profile)
+    goal = GOAL_TO_FOOD_GOAL.get(profile["goal"], "maintain")
+    split = MACRO_SPLIT.get(condition, MACRO_SPLIT["none"])
+    targets = [daily_target, *(daily_target * np.array(split) / KCAL_PER_GRAM).tolist()]
+    remaining = [round(target - consumed, 2) for target, consumed in zip(targets, totals)]
+
+    # Version first: if the catalog reloads in between, the entry is stored
+    # under the old version and simply misses next time
+    catalog_version = food_catalog.version()
+    index = food_catalog.recommendation_index()
+    state = (totals, daily_target, profile["diet_type"], condition, goal, catalog_version)
+    key = (user_id, day)
+    suggestions = recommendation_cache.get(key, state)
+    if suggestions is None:
+        suggestions = index.recommend(profile["diet_type"], condition, goal, remaining, daily_target)
+        recommendation_cache.set(key, state, suggestions)
+
+    return dict(zip(("calories", "protein", "carbs", "fats"), remaining)), suggestions[:limit]
@@ -0,0 +1,202 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .models import PatientReminder, User
+
+REMINDER_BATCH_SIZE = 100
+# A reminder that failed this many times stays queued but is no longer picked up
+MAX_SEND_ATTEMPTS = 3
+# A claimed batch whose worker died without recording the outcome is picked up
+# again after this long
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+RECURRENCE_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+
+def enqueue_reminders(reminders):
+    """
+    Queues the unsent, not yet queued reminders in `reminders` (a queryset) for
+    the dispatch worker with a single UPDATE. Returns how many were queued.
+    Reminders already queued keep their attempts, so queuing again never
+    lifts MAX_SEND_ATTEMPTS.
+    """
+    return reminders.filter(sent_at__isnull=True, queued_at__isnull=True).update(queued_at=now())
+
+
+def queue_due_reminders():
+    """
+    Queues every unsent, not yet queued reminder whose date has passed, with
+    one UPDATE served by the partial index on unsent reminders.
+    """
+    return PatientReminder.objects.filter(
+        sent_at__isnull=True,
+        queued_at__isnull=True,
+        date__lte=now(),
+    ).update(queued_at=now())
+
+
+def next_occurrence(reminder, current_time):
+    """
+    The unsaved follow-up of a recurring reminder, or None when it does not
+    repeat (any more). Occurrences missed while no worker was running are skipped.
+    """
+    interval = RECURRENCE_INTERVALS.get(reminder.recurrence)
+    if interval is None:
+        return None
+    next_date = reminder.date + interval
+    while next_date <= current_time:
+        next_date += interval
+    if reminder.repeat_until and next_date > reminder.repeat_until:
+        return None
+    return PatientReminder(
+        user_id=reminder.user_id,
+        title=reminder.title,
+        message=reminder.message,
+        date=next_date,
+        recurrence=reminder.recurrence,
+        repeat_until=reminder.repeat_until,
+        created_by_id=reminder.created_by_id,
+    )
+
+
+def queued_reminders():
+    """Queued reminders that can be sent: not given up on, and not claimed by a live worker."""
+    return PatientReminder.objects.filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=now() - CLAIM_TIMEOUT),
+        sent_at__isnull=True,
+        queued_at__isnull=False,
+        attempts__lt=MAX_SEND_ATTEMPTS,
+    )
+
+
+def build_message(reminder, connection):
+    return EmailMessage(
+        subject=reminder.title,
+        body=reminder.message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[reminder.user.email],
+        connection=connection,
+    )
+
+
+def send_batch(reminders, connection):
+    """
+    Sends one batch over an already open connection. A failing message does
+    not stop the batch. Stamps `sent_at` on every delivered reminder with one
+    UPDATE and records failures with one bulk UPDATE.
+    Returns (sent, failed) counts.
+    """
+    sent = []
+    failed = []
+    for reminder in reminders:
+        try:
+            build_message(reminder, connection).send()
+        except Exception as error:  # SMTP errors come in many types; retry them all
+            reminder.attempts += 1
+            reminder.last_error = repr(error)[:1000]
+            reminder.claimed_at = None
+            failed.append(reminder)
+        else:
+            sent.append(reminder)
+
+    current_time = now()
+    if sent:
+        PatientReminder.objects.filter(pk__in=[reminder.pk for reminder in sent]).update(
+            sent_at=current_time, queued_at=None, claimed_at=None, last_error=""
+        )
+        follow_ups = [occurrence for occurrence in (next_occurrence(r, current_time) for r in sent) if occurrence]
+        if follow_ups:
+            PatientReminder.objects.bulk_create(follow_ups)
+    if failed:
+        PatientReminder.objects.bulk_update(failed, ["attempts", "last_error", "claimed_at"])
+    return len(sent), len(failed)
+
+
+def dispatch_queued(batch_size=REMINDER_BATCH_SIZE):
+    """
+    Sends every queued reminder once, in id order and in batches, reusing one
+    mail connection for the whole run. Failed reminders stay queued for the
+    next run until they hit MAX_SEND_ATTEMPTS.
+    Each batch is claimed (claimed_at) in a short SELECT ... FOR UPDATE SKIP
+    LOCKED transaction and sent after it commits, so several workers can run
+    side by side without sending the same reminder twice, and a slow SMTP
+    server never holds row locks. A claim left by a crashed worker expires
+    after CLAIM_TIMEOUT.
+    Returns {"sent": n, "failed": n}.
+    """
+    totals = {"sent": 0, "failed": 0}
+    last_id = 0
+    with get_connection() as connection:
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    queued_reminders()
+                    .filter(pk__gt=last_id)
+                    .select_related("user")
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .order_by("pk")[:batch_size]
+                )
+                if not batch:
+                    break
+                PatientReminder.objects.filter(pk__in=[reminder.pk for reminder in batch]).update(claimed_at=now())
+            last_id = batch[-1].pk
+            sent, failed = send_batch(batch, connection)
+            totals["sent"] += sent
+            totals["failed"] += failed
+    return totals
+
+
+# ---------------------- Campaigns ----------------------
+CAMPAIGN_CHUNK_SIZE = 5000
+
+
+def resolve_audience(audience):
+    """
+    Active patients matching the campaign filters, as a queryset of user ids.
+    Supported keys: country, diet_type, goal, activity_level, gender,
+    diabetic (bool), min_hba1c / max_hba1c, insulin_dependent (bool).
+    """
+    users = User.objects.filter(role="user", is_active=True)
+    for field in ("country", "diet_type", "goal", "activity_level", "gender"):
+        if audience.get(field):
+            users = users.filter(**{f"userprofile__{field}": audience[field]})
+
+    if audience.get("diabetic") is not None:
+        users = users.filter(userprofile__diabeticprofile__isnull=not audience["diabetic"])
+    if audience.get("min_hba1c") is not None:
+        users = users.filter(userprofile__diabeticprofile__hba1c__gt=audience["min_hba1c"])
+    if audience.get("max_hba1c") is not None:
+        users = users.filter(userprofile__diabeticprofile__hba1c__lt=audience["max_hba1c"])
+    if audience.get("insulin_dependent") is not None:
+        users = users.filter(userprofile__diabeticprofile__insulin_dependent=audience["insulin_dependent"])
+    return users.values_list("id", flat=True)
+
+
+def create_campaign(audience, created_by=None, chunk_size=CAMPAIGN_CHUNK_SIZE, **reminder_fields):
+    """
+    Creates one PatientReminder per matching patient. The audience is streamed
+    from the database and inserted with chunked bulk_create in one transaction.
+    Returns the number of reminders created.
+    """
+    created = 0
+    user_ids = resolve_audience(audience).order_by("id").iterator(chunk_size=chunk_size)
+    with transaction.atomic():
+        while True:
+            chunk = list(islice(user_ids, chunk_size))
+            if not chunk:
+                break
+            PatientReminder.objects.bulk_create(
+                [PatientReminder(user_id=user_id, created_by=created_by, **reminder_fields) for user_id in chunk],
+                batch_size=chunk_size,
+            )
+            created += len(chunk)
+    return created
@@ -0,0 +1,98 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Avg, Count
+from django.db.models.functions import TruncDate
+
+from .dashboard import REVENUE_PER_ACTIVE_PATIENT
+from .models import AppReport, Feedback, User, UserMeal
+from .rollups import day_bounds
+
+# A patient counts as active on a day if they logged a meal in this many days up to it
+ACTIVE_WINDOW_DAYS = 7
+
+REPORT_FIELDS = [
+    "total_users", "new_users", "active_patients", "meals_logged",
+    "total_revenue", "feedback_count", "average_rating", "feedback_summary",
+]
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def build_reports(start, end):
+    """
+    Builds unsaved AppReport snapshots for every day in [start, end].
+    Each metric is read with one grouped query for the whole range, and the
+    running user total continues from the snapshot before `start` when there is one.
+    """
+    range_start, range_end = day_bounds(start)[0], day_bounds(end)[1]
+
+    previous = AppReport.objects.filter(report_date=start - timedelta(days=1)).first()
+    patients = User.objects.filter(role="user")
+    if previous:
+        total_users = previous.total_users
+    else:
+        total_users = patients.filter(date_joined__lt=range_start).count()
+
+    new_users = dict(
+        patients.filter(date_joined__gte=range_start, date_joined__lt=range_end)
+        .annotate(day=TruncDate("date_joined")).values("day")
+        .annotate(count=Count("id")).values_list("day", "count").order_by()
+    )
+    meals_logged = dict(
+        UserMeal.objects.filter(date__gte=start, date__lte=end)
+        .values("date").annotate(count=Count("id")).values_list("date", "count").order_by()
+    )
+    feedback = {
+        row["day"]: row
+        for row in Feedback.objects.filter(created_at__gte=range_start, created_at__lt=range_end)
+        .annotate(day=TruncDate("created_at")).values("day")
+        .annotate(count=Count("id"), average=Avg("rating")).order_by()
+    }
+
+    # Distinct (day, user) pairs, then a sliding window for active patients
+    users_by_day = defaultdict(set)
+    for day, user_id in (
+        UserMeal.objects.filter(date__gte=start - timedelta(days=ACTIVE_WINDOW_DAYS - 1), date__lte=end)
+        .values_list("date", "user").distinct().order_by()
+    ):
+        users_by_day[day].add(user_id)
+
+    reports = []
+    for day in _days(start, end):
+        total_users += new_users.get(day, 0)
+        active = set().union(*(users_by_day.get(day - timedelta(days=offset), ()) for offset in range(ACTIVE_WINDOW_DAYS)))
+        day_feedback = feedback.get(day, {"count": 0, "average": None})
+        average = round(day_feedback["average"], 2) if day_feedback["average"] is not None else None
+        reports.append(AppReport(
+            report_date=day,
+            total_users=total_users,
+            new_users=new_users.get(day, 0),
+            active_patients=len(active),
+            meals_logged=meals_logged.get(day, 0),
+            total_revenue=len(active) * REVENUE_PER_ACTIVE_PATIENT,
+            feedback_count=day_feedback["count"],
+            average_rating=average,
+            feedback_summary=(
+                f"{day_feedback['count']} feedback(s), average rating {average if average is not None else 'n/a'}"
+                if day_feedback["count"] else ""
+            ),
+        ))
+    return reports
+
+
+def generate_reports(start, end):
+    """Builds and upserts the snapshots for [start, end]. Returns them."""
+    reports = build_reports(start, end)
+    AppReport.objects.bulk_create(
+        reports,
+        update_conflicts=True,
+        unique_fields=["report_date"],
+        update_fields=REPORT_FIELDS,
+    )
+    return reports
@@ -0,0 +1,219 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import DailyNutritionSummary, FoodItem, UserMeal
+from .nutrients import NUTRIENT_FIELDS
+
+SUMMARY_FIELDS = tuple(NUTRIENT_FIELDS) + ("glycemic_load",)
+
+
+def meal_day(consumed_at):
+    """The summary date a meal belongs to (its consumed_at in the current time zone)."""
+    return timezone.localdate(consumed_at) if timezone.is_aware(consumed_at) else consumed_at.date()
+
+
+def day_bounds(day):
+    """[start, end) datetimes covering `day` in the current time zone."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def add_meals(meals):
+    """
+    Adds newly created meals to their users' daily rows with in-place
+    `F() + value` updates: one UPDATE (or INSERT) per (user, day) in the batch.
+    """
+    groups = defaultdict(lambda: dict.fromkeys(SUMMARY_FIELDS + ("meal_count",), 0))
+    for meal in meals:
+        totals = groups[(meal.user_id, meal_day(meal.consumed_at))]
+        for field in SUMMARY_FIELDS:
+            totals[field] += getattr(meal, field) or 0
+        totals["meal_count"] += 1
+
+    for (user_id, day), totals in groups.items():
+        increments = {field: F(field) + value for field, value in totals.items()}
+        if DailyNutritionSummary.objects.filter(user_id=user_id, date=day).update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                DailyNutritionSummary.objects.create(user_id=user_id, date=day, **totals)
+        except IntegrityError:
+            # Another request created the row first
+            DailyNutritionSummary.objects.filter(user_id=user_id, date=day).update(**increments)
+
+
+def rebuild_day(user_id, day):
+    """Recomputes one user's row for `day` from UserMeal (used after edits and deletes)."""
+    start, end = day_bounds(day)
+    totals = UserMeal.objects.filter(user_id=user_id, consumed_at__gte=start, consumed_at__lt=end).aggregate(
+        meal_count=Count("id"), **{field: Sum(field) for field in SUMMARY_FIELDS}
+    )
+    if not totals["meal_count"]:
+        DailyNutritionSummary.objects.filter(user_id=user_id, date=day).delete()
+        return
+    DailyNutritionSummary.objects.update_or_create(
+        user_id=user_id,
+        date=day,
+        defaults={field: value or 0 for field, value in totals.items()},
+    )
+
+
+def rebuild_summaries(user_ids=None, start=None, end=None, batch_size=1000):
+    """
+    Rebuilds rollup rows from scratch with one grouped query, optionally limited
+    to some users and/or an inclusive [start, end] date range.
+    Returns the number of rows written.
+    """
+    meals = UserMeal.objects.all()
+    summaries = DailyNutritionSummary.objects.all()
+    if user_ids:
+        meals = meals.filter(user_id__in=user_ids)
+        summaries = summaries.filter(user_id__in=user_ids)
+    if start:
+        meals = meals.filter(consumed_at__gte=day_bounds(start)[0])
+        summaries = summaries.filter(date__gte=start)
+    if end:
+        meals = meals.filter(consumed_at__lt=day_bounds(end)[1])
+        summaries = summaries.filter(date__lte=end)
+
+    rows = (
+        meals.annotate(day=TruncDate("consumed_at"))
+        .values("user", "day")
+        .annotate(meal_count=Count("id"), **{field: Sum(field) for field in SUMMARY_FIELDS})
+        .order_by()
+    )
+
+    written = 0
+    with transaction.atomic():
+        summaries.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(DailyNutritionSummary(
+                user_id=row["user"],
+                date=row["day"],
+                meal_count=row["meal_count"],
+                **{field: row[field] or 0 for field in SUMMARY_FIELDS},
+            ))
+            if len(batch) >= batch_size:
+                DailyNutritionSummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            DailyNutritionSummary.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+# ---------------------- Trends ----------------------
+TREND_BUCKETS = {
+    "day": None,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+
+def bucket_start(day, bucket):
+    """First day of the bucket containing `day` (weeks start on Monday, like TruncWeek)."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, bucket):
+    if bucket == "week":
+        return day + timedelta(days=7)
+    if bucket == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def nutrition_trend(user_id, start, end, bucket="day", window=7):
+    """
+    Per-bucket nutrient totals for one user over the inclusive [start, end] date
+    range, read from the daily rollup with a single grouped query.
+    Empty buckets are returned as zeros, and each bucket carries the rolling
+    average of the last `window` buckets (itself included).
+    """
+    summaries = DailyNutritionSummary.objects.filter(user_id=user_id, date__gte=start, date__lte=end)
+    trunc = TREND_BUCKETS[bucket]
+    if trunc is None:
+        rows = summaries.values("date", "meal_count", *SUMMARY_FIELDS)
+        by_start = {row.pop("date"): row for row in rows}
+    else:
+        rows = (
+            summaries.annotate(bucket=trunc("date"))
+            .values("bucket")
+            .annotate(meal_count=Sum("meal_count"), **{field: Sum(field) for field in SUMMARY_FIELDS})
+            .order_by()
+        )
+        by_start = {row.pop("bucket"): row for row in rows}
+
+    empty = dict.fromkeys(SUMMARY_FIELDS + ("meal_count",), 0)
+    buckets = []
+    current = bucket_start(start, bucket)
+    while current <= end:
+        totals = {**empty, **by_start.get(current, {})}
+        buckets.append({"start": current, **{field: round(value, 2) for field, value in totals.items()}})
+        current = next_bucket(current, bucket)
+
+    for index, entry in enumerate(buckets):
+        recent = buckets[max(0, index - window + 1):index + 1]
+        entry["rolling_avg"] = {
+            field: round(sum(item[field] for item in recent) / len(recent), 2) for field in SUMMARY_FIELDS
+        }
+    return buckets
+
+
+# ---------------------- Glycemic load ----------------------
+# Daily glycemic load above this is considered high (under 80 is low)
+HIGH_DAILY_GLYCEMIC_LOAD = 120
+
+
+def backfill_glycemic_load():
+    """
+    Fills UserMeal.glycemic_load for meals logged before it was stored, from the
+    linked food's glycemic index, with a single UPDATE. Returns the row count.
+    """
+    glycemic_index = FoodItem.objects.filter(pk=OuterRef("food_item_id")).values("glycemic_index")[:1]
+    return UserMeal.objects.filter(
+        glycemic_load__isnull=True, carbs__isnull=False, food_item__glycemic_index__isnull=False
+    ).update(glycemic_load=Subquery(glycemic_index) * F("carbs") / 100)
+
+
+def glycemic_load_trends(user_ids, start, end):
+    """
+    Daily glycemic load for many users over the inclusive [start, end] range,
+    read from the rollup with two queries: one grouped query for the per-user
+    average/peak/high days and one for the daily series.
+    Returns {user_id: {"average", "peak", "high_days", "days_logged", "daily"}}.
+    """
+    summaries = DailyNutritionSummary.objects.filter(user_id__in=user_ids, date__gte=start, date__lte=end)
+    stats = (
+        summaries.values("user_id")
+        .annotate(
+            average=Avg("glycemic_load"),
+            peak=Max("glycemic_load"),
+            high_days=Count("id", filter=Q(glycemic_load__gt=HIGH_DAILY_GLYCEMIC_LOAD)),
+            days_logged=Count("id"),
+        )
+        .order_by()
+    )
+    trends = {
+        row.pop("user_id"): {
+            **row,
+            "average": round(row["average"], 2),
+            "peak": round(row["peak"], 2),
+            "daily": [],
+        }
+        for row in stats
+    }
+    for user_id, day, load in summaries.order_by("user_id", "date").values_list("user_id", "date", "glycemic_load"):
+        trends[user_id]["daily"].append({"date": day, "glycemic_load": round(load, 2)})
+    return trends
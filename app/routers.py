@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+REPLICA_DATABASE = "replica"
+# After a write, the user's reads stay on default this long, so a lagging
+# replica never hides what they just saved (read-your-writes).
+READ_YOUR_WRITES_SECONDS = 15
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def recent_write_key(user_id):
+    return f"db:recent-write:{user_id}"
+
+
+def mark_recent_write(user_id):
+    cache.set(recent_write_key(user_id), True, READ_YOUR_WRITES_SECONDS)
+
+
+def has_recent_write(user_id):
+    return cache.get(recent_write_key(user_id)) is not None
+
+
+async def ahas_recent_write(user_id):
+    return await cache.aget(recent_write_key(user_id)) is not None
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Sends the reads made inside the block to the read replica, when one is
+    configured (DATABASE_REPLICA_URL). Writes always go to default.
+    Being a context variable, it follows sync_to_async() and asyncio tasks
+    but not plain threads.
+    """
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the replica only inside replica_reads(); everything else,
+    including all writes and migrations, stays on default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and REPLICA_DATABASE in settings.DATABASES:
+            return REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DATABASE
+
+
+class ReplicaReadMixin:
+    """
+    Opt-in for read-heavy APIViews: GET/HEAD requests read from the replica,
+    unless the requesting user wrote something in the last
+    READ_YOUR_WRITES_SECONDS (meal logged, or a write through a view using
+    this mixin), in which case they stay on default.
+    """
+
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica = request.method in ("GET", "HEAD") and not has_recent_write(request.user.pk)
+        self._replica_token = _use_replica.set(use_replica)
+
+    def dispatch(self, request, *args, **kwargs):
+        # Reset even when an unhandled exception skips finalize_response();
+        # otherwise the worker thread would keep reading from the replica
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._replica_token is not None:
+                _use_replica.reset(self._replica_token)
+                self._replica_token = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400 and request.user.is_authenticated:
+            mark_recent_write(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
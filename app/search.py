@@ -0,0 +1,212 @@
+import math
+from bisect import bisect_left
+
+import numpy as np
+
+from .catalog import normalize_food_name
+
+# How many prefix matches (that pass the filters) are ranked at most. Keeps
+# one-letter queries cheap on very large catalogs.
+MAX_PREFIX_SCAN = 1000
+# Minimum trigram similarity (0..1) for a fuzzy match to be returned.
+MIN_FUZZY_SIMILARITY = 0.3
+
+NO_MATCHES = (np.empty(0, dtype=np.int32), np.empty(0))
+
+
+def trigrams(text):
+    """Returns the set of character trigrams of `text`, padded so word edges count."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams to the strings containing them, answering
+    "which strings have a trigram Jaccard similarity of at least
+    MIN_FUZZY_SIMILARITY with this query".
+    """
+
+    def __init__(self, texts):
+        postings = {}
+        sizes = []
+        for position, text in enumerate(texts):
+            grams = trigrams(text)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        # Sorted int arrays: candidates are counted and checked with numpy
+        self._postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.int32)
+
+    def matches(self, query_grams):
+        """
+        Returns (positions, similarities) arrays for the strings whose similarity
+        with the query trigrams is at least MIN_FUZZY_SIMILARITY.
+        A match has to share at least `needed` trigrams with the query, so it must
+        contain one of the `len(grams) - needed + 1` rarest query trigrams. Only
+        those posting lists are scanned for candidates; the few frequent trigrams
+        left over are looked up (binary search) only for candidates that can
+        still reach the threshold.
+        """
+        query_size = len(query_grams)
+        needed = max(1, math.ceil(MIN_FUZZY_SIMILARITY * query_size))
+        postings = sorted(
+            (self._postings[gram] for gram in query_grams if gram in self._postings), key=len,
+        )
+        # Trigrams no string contains are the rarest of all
+        split = max(0, query_size - needed + 1 - (query_size - len(postings)))
+        rare, frequent = postings[:split], postings[split:]
+        if not rare:
+            return NO_MATCHES
+
+        candidates, common = np.unique(np.concatenate(rare), return_counts=True)
+        sizes = self._sizes[candidates]
+
+        # Cheap upper bound first: even if every frequent trigram matched, can the
+        # candidate reach the threshold?  best * (1 + t) / t >= |query| + |text|
+        ratio = (1 + MIN_FUZZY_SIMILARITY) / MIN_FUZZY_SIMILARITY
+        possible = (common + len(frequent)) * ratio >= query_size + sizes
+        candidates, common, sizes = candidates[possible], common[possible], sizes[possible]
+
+        for posting in frequent:
+            found = np.searchsorted(posting, candidates)
+            common += posting[np.minimum(found, len(posting) - 1)] == candidates
+        similarities = common / (query_size + sizes - common)
+        similar = similarities >= MIN_FUZZY_SIMILARITY
+        return candidates[similar], similarities[similar]
+
+
+class FoodSearchIndex:
+    """
+    In-memory search index over a list of FoodItem objects.
+    - Prefix lookups use a sorted list of name and word keys, so "tik" finds
+      "Paneer Tikka" with a binary search; the matching range is scored with numpy.
+    - Typos are handled by trigram similarity against whole names and against
+      each word of a name, so "panir" still finds "Paneer Tikka".
+    - Filters (food type, condition, goal) apply before anything is counted
+      or cut off, so a filtered search sees every food that passes them.
+    Built once per catalog version by FoodCatalog.search_index().
+    """
+
+    def __init__(self, food_items):
+        self._items = list(food_items)
+        self._names = [normalize_food_name(item.name) for item in self._items]
+
+        keys = []
+        word_positions = {}
+        for position, name in enumerate(self._names):
+            keys.append((name, True, position))
+            words = name.split()
+            for word in words[1:]:
+                keys.append((word, False, position))
+            for word in set(words):
+                word_positions.setdefault(word, []).append(position)
+        keys.sort()
+        self._keys = [key for key, _, _ in keys]
+        self._key_is_name = np.array([is_name for _, is_name, _ in keys], dtype=bool)
+        self._key_positions = np.array([position for _, _, position in keys], dtype=np.int32)
+
+        self._name_lengths = np.array([len(name) for name in self._names])
+        # Tie-break order: shortest name first, then alphabetical
+        by_length = sorted(range(len(self._names)), key=lambda position: (len(self._names[position]), self._names[position]))
+        self._tie_rank = np.empty(len(self._names), dtype=np.int32)
+        self._tie_rank[by_length] = np.arange(len(by_length), dtype=np.int32)
+        self._filter_fields = {
+            "food_type": np.array([item.food_type for item in self._items], dtype=object),
+            "condition": np.array([item.suitable_for_conditions for item in self._items], dtype=object),
+            "goal": np.array([item.suitable_for_goal for item in self._items], dtype=object),
+        }
+
+        self._name_trigrams = TrigramIndex(self._names)
+        self._word_positions = list(word_positions.values())
+        self._word_trigrams = TrigramIndex(word_positions)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _passes_filters(self, positions, filters):
+        keep = np.ones(len(positions), dtype=bool)
+        for field, value in filters.items():
+            keep &= self._filter_fields[field][positions] == value
+        return keep
+
+    def _prefix_matches(self, query, filters):
+        """
+        Returns (positions, scores) for names that start with `query` (scored
+        2..3, 3 for an exact match) or have a later word starting with it
+        (1..2). Shorter names score higher. At most MAX_PREFIX_SCAN matching
+        keys are scored, counting only the ones that pass the filters.
+        """
+        start = bisect_left(self._keys, query)
+        end = bisect_left(self._keys, query + "\U0010ffff", start)
+        positions = self._key_positions[start:end]
+        is_name = self._key_is_name[start:end]
+        if filters:
+            keep = self._passes_filters(positions, filters)
+            positions, is_name = positions[keep], is_name[keep]
+        positions, is_name = positions[:MAX_PREFIX_SCAN], is_name[:MAX_PREFIX_SCAN]
+
+        lengths = self._name_lengths[positions]
+        scores = np.where(is_name, 2.0, 1.0) + len(query) / lengths
+        scores[is_name & (lengths == len(query))] = 3.0
+        # A name can match both as a whole and by a later word; keep its best score
+        order = np.lexsort((-scores, positions))
+        positions, scores = positions[order], scores[order]
+        first = np.ones(len(positions), dtype=bool)
+        first[1:] = positions[1:] != positions[:-1]
+        return positions[first], scores[first]
+
+    def _fuzzy_matches(self, query):
+        """
+        Returns {position: similarity} for the names similar to `query`, scored
+        as the best of the whole-name similarity and the similarity with any
+        single word of the name (a typo in one word of "Paneer Tikka").
+        """
+        query_grams = trigrams(query)
+        positions, similarities = self._name_trigrams.matches(query_grams)
+        scores = dict(zip(positions.tolist(), similarities.tolist()))
+        if " " not in query:
+            words, similarities = self._word_trigrams.matches(query_grams)
+            for word, similarity in zip(words.tolist(), similarities.tolist()):
+                for position in self._word_positions[word]:
+                    if similarity > scores.get(position, 0):
+                        scores[position] = similarity
+        return scores
+
+    def search(self, query, limit=10, food_type=None, condition=None, goal=None):
+        """
+        Returns up to `limit` (FoodItem, score) pairs, best first.
+        Exact and prefix matches always rank above fuzzy (typo) matches.
+        """
+        query = normalize_food_name(query)
+        if not query or limit <= 0:
+            return []
+        filters = {
+            field: value
+            for field, value in (("food_type", food_type), ("condition", condition), ("goal", goal))
+            if value
+        }
+
+        positions, scores = self._prefix_matches(query, filters)
+
+        # Fall back to fuzzy matching when the prefixes that pass the filters
+        # do not fill the page
+        if len(positions) < limit:
+            fuzzy = self._fuzzy_matches(query)
+            if fuzzy:
+                fuzzy_positions = np.fromiter(fuzzy.keys(), dtype=np.int32, count=len(fuzzy))
+                fuzzy_scores = np.fromiter(fuzzy.values(), dtype=float, count=len(fuzzy))
+                keep = ~np.isin(fuzzy_positions, positions)
+                if filters:
+                    keep &= self._passes_filters(fuzzy_positions, filters)
+                positions = np.concatenate([positions, fuzzy_positions[keep]])
+                scores = np.concatenate([scores, fuzzy_scores[keep]])
+
+        # Ties go to the shortest name: a typo of "paneer" scores the same against
+        # every name containing that word, and "Paneer" itself should come first
+        ranked = np.lexsort((self._tie_rank[positions], -scores))[:limit]
+        return [
+            (self._items[position], round(score, 3))
+            for position, score in zip(positions[ranked].tolist(), scores[ranked].tolist())
+        ]
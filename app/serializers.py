@@ -1,10 +1,15 @@
 from rest_framework import serializers
-from .models import User, UserProfile, DiabeticProfile,UserMeal, PatientReminder
+from .middleware import TimedRepresentationMixin
+from .models import User, UserProfile, DiabeticProfile,UserMeal, PatientReminder, FoodItem, AppReport
+from .rollups import SUMMARY_FIELDS
 
 
+class TimedModelSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    """ModelSerializer whose output time shows up as "serializer" in the request metrics."""
+
 
 # Serializer for UserProfile model to convert it to JSON and validate incoming data
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedModelSerializer):
     """
     Serializer for UserProfile model.
     Converts UserProfile model instances to JSON and validates incoming data.
@@ -15,7 +20,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         exclude = ['user']  # Exclude the user field since it's linked automatically
 
 # Serializer for User model registration
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedModelSerializer):
     """
     Serializer for User model registration.
     Includes nested UserProfileSerializer to create both User and UserProfile in one request.
@@ -37,14 +42,36 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 # Serializer to convert DiabeticProfile model to JSON and validate incoming data
-class DiabeticProfileSerializer(serializers.ModelSerializer):
+class DiabeticProfileSerializer(TimedModelSerializer):
     user_profile = serializers.PrimaryKeyRelatedField(read_only=True)
     class Meta:
         model = DiabeticProfile
         fields = '__all__'  # Includes all fields from the model
 
+# Serializer for a patient row on the nutritionist dashboard
+class NutritionistPatientSerializer(UserProfileSerializer):
+    """
+    UserProfile plus the patient's email, diabetic profile (or null) and latest
+    daily nutrition totals. Expects the view to have select_related the user and
+    diabetic profile and attached `latest_summary` to each profile.
+    """
+    user_id = serializers.IntegerField(read_only=True)
+    email = serializers.EmailField(source="user.email", read_only=True)
+    diabetic_profile = DiabeticProfileSerializer(source="diabeticprofile", read_only=True)
+    latest_totals = serializers.SerializerMethodField()
+
+    class Meta(UserProfileSerializer.Meta):
+        pass
+
+    def get_latest_totals(self, profile):
+        summary = getattr(profile, "latest_summary", None)
+        if summary is None:
+            return None
+        return {"date": summary.date, **{field: getattr(summary, field) for field in SUMMARY_FIELDS}}
+
+
 # Serializer for UserMeal model to handle meal logging
-class UserMealSerializer(serializers.ModelSerializer):
+class UserMealSerializer(TimedModelSerializer):
     
     food_name = serializers.CharField()
     meal_type = serializers.ChoiceField(choices=["lunch", "breakfast", "dinner", "snack"])
@@ -53,31 +80,59 @@ class UserMealSerializer(serializers.ModelSerializer):
         model = UserMeal
         fields = [
             "id", "food_name", "meal_type", "unit", "quantity", "calories",
-            "protein", "carbs", "fats", "sugar", "fiber",
+            "protein", "carbs", "fats", "sugar", "fiber", "glycemic_load",
             "consumed_at", "remarks", "date"
         ]
         read_only_fields = [
-            "calories", "protein", "carbs", "fats", "sugar", "fiber", "consumed_at", "date"
+            "calories", "protein", "carbs", "fats", "sugar", "fiber", "glycemic_load", "consumed_at", "date"
         ]
 
 
-class PatientReminderSerializer(serializers.ModelSerializer):
+# Serializer for FoodItem search results
+class FoodItemSerializer(TimedModelSerializer):
     class Meta:
-        model = PatientReminder
+        model = FoodItem
         fields = '__all__'
 
 
+class PatientReminderSerializer(TimedModelSerializer):
+    class Meta:
+        model = PatientReminder
+        fields = '__all__'
+        read_only_fields = ["queued_at", "claimed_at", "attempts", "last_error", "created_by"]
 
 
+# Audience filters for a reminder campaign (all optional, combined with AND)
+class ReminderAudienceSerializer(serializers.Serializer):
+    country = serializers.CharField(required=False)
+    diet_type = serializers.ChoiceField(choices=UserProfile._meta.get_field("diet_type").choices, required=False)
+    goal = serializers.ChoiceField(choices=UserProfile._meta.get_field("goal").choices, required=False)
+    activity_level = serializers.ChoiceField(choices=UserProfile._meta.get_field("activity_level").choices, required=False)
+    gender = serializers.ChoiceField(choices=UserProfile._meta.get_field("gender").choices, required=False)
+    diabetic = serializers.BooleanField(allow_null=True, default=None)
+    min_hba1c = serializers.FloatField(required=False)
+    max_hba1c = serializers.FloatField(required=False)
+    insulin_dependent = serializers.BooleanField(allow_null=True, default=None)
 
 
+# One reminder sent to every patient matching the audience
+class ReminderCampaignSerializer(TimedModelSerializer):
+    audience = ReminderAudienceSerializer(default=dict)
 
+    class Meta:
+        model = PatientReminder
+        fields = ["title", "message", "date", "recurrence", "repeat_until", "audience"]
 
 
+# Patients for the batch calorie recommendation; omitted means all assigned patients
+class PatientIdsSerializer(serializers.Serializer):
+    patient_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, max_length=5000
+    )
 
 
-
-
-
-
-
+# Serializer for the daily AppReport snapshots
+class AppReportSerializer(TimedModelSerializer):
+    class Meta:
+        model = AppReport
+        exclude = ["id"]
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import account_state_key, remember_account_state
+from .caching import invalidate_responses
+from .catalog import food_catalog
+from .models import FoodItem, User, UserMeal, UserProfile
+from .recommendations import recommendation_cache
+from .rollups import add_meals, meal_day, rebuild_day
+from .routers import mark_recent_write
+from .targets import calorie_target_key, invalidate_calorie_target
+
+
+# ---------------------- Food catalog invalidation ----------------------
+@receiver(post_save, sender=FoodItem)
+@receiver(post_delete, sender=FoodItem)
+def invalidate_food_catalog(sender, **kwargs):
+    food_catalog.invalidate()
+    invalidate_responses("foods")
+
+
+# ---------------------- Daily nutrition rollup ----------------------
+# Bulk inserts (UserMealViewSet.create) call add_meals() and meals_changed()
+# themselves since bulk_create does not send these signals.
+def meals_changed(user_id):
+    """Drops what is cached from a user's meals and pins their reads to the primary."""
+    recommendation_cache.forget(user_id)
+    mark_recent_write(user_id)
+    invalidate_responses("meals", user_id)
+
+
+@receiver(pre_save, sender=UserMeal)
+def remember_previous_meal_day(sender, instance, **kwargs):
+    instance._previous_summary_key = None
+    if instance.pk:
+        previous = UserMeal.objects.filter(pk=instance.pk).values_list("user_id", "consumed_at").first()
+        if previous:
+            instance._previous_summary_key = (previous[0], meal_day(previous[1]))
+
+
+@receiver(post_save, sender=UserMeal)
+def update_summary_on_meal_save(sender, instance, created, **kwargs):
+    meals_changed(instance.user_id)
+    if created:
+        add_meals([instance])
+        return
+    keys = {(instance.user_id, meal_day(instance.consumed_at))}
+    if getattr(instance, "_previous_summary_key", None):
+        keys.add(instance._previous_summary_key)
+    for user_id, day in keys:
+        rebuild_day(user_id, day)
+
+
+@receiver(post_delete, sender=UserMeal)
+def update_summary_on_meal_delete(sender, instance, **kwargs):
+    meals_changed(instance.user_id)
+    rebuild_day(instance.user_id, meal_day(instance.consumed_at))
+
+
+# ---------------------- Calorie target cache ----------------------
+@receiver(post_save, sender=UserProfile)
+def invalidate_target_on_profile_change(sender, instance, **kwargs):
+    invalidate_calorie_target(instance)
+    invalidate_responses("profile", instance.user_id)
+
+
+@receiver(post_delete, sender=UserProfile)
+def drop_target_on_profile_delete(sender, instance, **kwargs):
+    cache.delete(calorie_target_key(instance.user_id))
+    invalidate_responses("profile", instance.user_id)
+
+
+# ---------------------- Token account state ----------------------
+@receiver(post_save, sender=User)
+def refresh_account_state(sender, instance, **kwargs):
+    remember_account_state(instance)
+
+
+@receiver(post_delete, sender=User)
+def forget_account_state(sender, instance, **kwargs):
+    cache.delete(account_state_key(instance.pk))
@@ -0,0 +1,104 @@
+import numpy as np
+from django.core.cache import cache
+
+from utils.utils import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS, calculate_calorie_target
+
+from .models import UserProfile
+
+# UserProfile fields the calorie target depends on
+TARGET_FIELDS = ("weight_kg", "height_cm", "age", "gender", "activity_level", "goal")
+# Safety net only: entries are dropped as soon as one of TARGET_FIELDS changes
+CALORIE_TARGET_TTL = 24 * 60 * 60
+
+
+def calorie_target_key(user_id):
+    return f"calorie-target:{user_id}"
+
+
+def profile_fingerprint(values):
+    return tuple(values[field] for field in TARGET_FIELDS)
+
+
+def _target_entry(values):
+    """Cache entry for a UserProfile .values() row: the target plus its fingerprint."""
+    target = calculate_calorie_target(
+        weight=values["weight_kg"],
+        height=values["height_cm"],
+        age=values["age"],
+        gender=values["gender"],
+        activity_level=values["activity_level"],
+        goal=values["goal"],
+    )
+    return {"fingerprint": profile_fingerprint(values), "target": target}
+
+
+def get_calorie_target(user_id):
+    """
+    Returns the cached calorie target for a user, computing it from their
+    UserProfile on a miss. Raises UserProfile.DoesNotExist without a profile.
+    """
+    entry = cache.get(calorie_target_key(user_id))
+    if entry is not None:
+        return entry["target"]
+
+    values = UserProfile.objects.filter(user_id=user_id).values(*TARGET_FIELDS).first()
+    if values is None:
+        raise UserProfile.DoesNotExist
+    entry = _target_entry(values)
+    cache.set(calorie_target_key(user_id), entry, CALORIE_TARGET_TTL)
+    return entry["target"]
+
+
+async def aget_calorie_target(user_id):
+    """Async version of get_calorie_target() for the ASGI views."""
+    entry = await cache.aget(calorie_target_key(user_id))
+    if entry is not None:
+        return entry["target"]
+
+    values = await UserProfile.objects.filter(user_id=user_id).values(*TARGET_FIELDS).afirst()
+    if values is None:
+        raise UserProfile.DoesNotExist
+    entry = _target_entry(values)
+    await cache.aset(calorie_target_key(user_id), entry, CALORIE_TARGET_TTL)
+    return entry["target"]
+
+
+def invalidate_calorie_target(profile):
+    """Drops the cached target if one of the fields it was computed from changed."""
+    key = calorie_target_key(profile.user_id)
+    entry = cache.get(key)
+    if entry is not None and entry["fingerprint"] != profile_fingerprint(vars(profile)):
+        cache.delete(key)
+
+
+def calculate_calorie_targets(profiles):
+    """
+    Vectorised calculate_calorie_target() for many profiles at once.
+    Takes UserProfile .values() rows (TARGET_FIELDS plus user_id) and returns
+    {user_id: target} with the same keys and rounding as the single-user version.
+    """
+    profiles = list(profiles)
+    if not profiles:
+        return {}
+    weight = np.array([row["weight_kg"] for row in profiles], dtype=np.float64)
+    height = np.array([row["height_cm"] for row in profiles], dtype=np.float64)
+    age = np.array([row["age"] for row in profiles], dtype=np.float64)
+    gender_offset = np.array([5 if row["gender"] == "male" else -161 for row in profiles], dtype=np.float64)
+    multiplier = np.array([ACTIVITY_MULTIPLIERS.get(row["activity_level"], 1.2) for row in profiles])
+    adjustment = np.array([GOAL_ADJUSTMENTS.get(row["goal"], 0) for row in profiles], dtype=np.float64)
+
+    bmr = 10 * weight + 6.25 * height - 5 * age + gender_offset
+    recommended = bmr * multiplier + adjustment
+
+    # np.rint rounds half to even, like Python's round()
+    return {
+        row["user_id"]: {
+            "recommended_calories": calories,
+            "goal": row["goal"],
+            "activity_level": row["activity_level"],
+            "bmr": rounded_bmr,
+        }
+        for row, calories, rounded_bmr in zip(
+            profiles, np.rint(recommended).astype(int).tolist(), np.rint(bmr).astype(int).tolist()
+        )
+    }
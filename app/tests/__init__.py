@@ -0,0 +1,5 @@
+# Run with an SQLite database, e.g.:
+#   DATABASE_URL=sqlite:///db.sqlite3 python manage.py test app
+# or against PostgreSQL with DATABASE_URL=postgres://... . Setting
+# DATABASE_REPLICA_URL as well adds a replica alias that mirrors default during
+# tests and enables the replica routing tests in test_database.py.
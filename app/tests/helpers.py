@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from app.authentication import ClaimsTokenObtainPairSerializer
+from app.models import User
+from app.routers import REPLICA_DATABASE
+
+
+def make_user(email, role="user", **fields):
+    return User.objects.create(email=email, role=role, **fields)
+
+
+def client_for(user):
+    client = APIClient()
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+class APITestCase(TestCase):
+    """
+    TestCase with an empty cache and a client that logs in with claims tokens.
+    When a replica is configured, replica reads use the default connection:
+    the test transaction is only visible there.
+    """
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        if REPLICA_DATABASE in connections:
+            replica = connections[REPLICA_DATABASE]
+            connections[REPLICA_DATABASE] = connections["default"]
+            cls.addClassCleanup(connections.__setitem__, REPLICA_DATABASE, replica)
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def client_for(self, user):
+        return client_for(user)
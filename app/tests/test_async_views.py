@@ -0,0 +1,66 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+
+from app.authentication import ClaimsTokenObtainPairSerializer
+from app.models import PatientReminder, UserMeal, UserProfile
+
+from .helpers import APITestCase, make_user
+
+# Sync URL name -> its /api/async/ twin
+ENDPOINTS = {
+    "daily_calorie_summary": "async-daily-calorie-summary",
+    "recommend_calories": "async-recommend-calories",
+    "owner-dashboard": "async-owner-dashboard",
+    "operator-report": "async-operator-report",
+}
+
+
+class AsyncViewParityTests(APITestCase):
+    """The async endpoints return the same JSON as their DRF counterparts."""
+
+    def setUp(self):
+        super().setUp()
+        self.patient = make_user("patient@example.com")
+        UserProfile.objects.create(
+            user=self.patient, name="Patient", age=30, gender="female", height_cm=160, weight_kg=60,
+            activity_level="moderate", goal="maintain", diet_type="vegetarian",
+        )
+        UserMeal.objects.create(
+            user=self.patient, food_name="Rajma", quantity=100, unit="g", meal_type="lunch",
+            calories=140, protein=8.7, carbs=22.8, fats=0.5, sugar=0.3, fiber=6.4, consumed_at=timezone.now(),
+        )
+        PatientReminder.objects.create(user=self.patient, sent_at=timezone.now())
+        self.users = {
+            "daily_calorie_summary": self.patient,
+            "recommend_calories": self.patient,
+            "owner-dashboard": make_user("owner@example.com", role="owner"),
+            "operator-report": make_user("operator@example.com", role="operator"),
+        }
+
+    def async_get(self, url_name, user):
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        return async_to_sync(AsyncClient().get)(reverse(url_name), headers={"Authorization": f"Bearer {token}"})
+
+    def test_same_json_as_the_sync_views(self):
+        for sync_name, async_name in ENDPOINTS.items():
+            with self.subTest(sync_name):
+                user = self.users[sync_name]
+                expected = self.client_for(user).get(reverse(sync_name))
+                response = self.async_get(async_name, user)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+
+    def test_missing_profile(self):
+        UserProfile.objects.filter(user=self.patient).delete()
+
+        response = self.async_get("async-recommend-calories", self.patient)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), self.client_for(self.patient).get(reverse("recommend_calories")).json())
+
+    def test_roles_and_authentication(self):
+        self.assertEqual(self.async_get("async-operator-report", self.patient).status_code, 403)
+        response = async_to_sync(AsyncClient().get)(reverse("async-daily-calorie-summary"))
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,54 @@
+from django.urls import reverse
+
+from app.models import User
+
+from .helpers import APITestCase, make_user
+
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+    def test_role_gated_views_see_the_token_role(self):
+        operator = make_user("operator@example.com", role="operator")
+        client = self.client_for(operator)
+
+        for url_name in ("operator-report", "report-history"):
+            with self.subTest(url_name=url_name):
+                response = client.get(reverse(url_name))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.wsgi_request.user.role, "operator")
+                self.assertIs(response.wsgi_request.user.is_active, True)
+
+    def test_no_user_select_on_cached_account_state(self):
+        operator = make_user("operator@example.com", role="operator")
+        client = self.client_for(operator)
+        client.get(reverse("report-history"))
+
+        # Only the AppReport query; the user comes from the token and the cache
+        with self.assertNumQueries(1):
+            response = client.get(reverse("report-history"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user.pk, operator.pk)
+
+    def test_other_roles_are_denied(self):
+        patient = make_user("patient@example.com")
+
+        response = self.client_for(patient).get(reverse("report-history"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        operator = make_user("operator@example.com", role="operator")
+        client = self.client_for(operator)
+        operator.is_active = False
+        operator.save()
+
+        self.assertEqual(client.get(reverse("report-history")).status_code, 401)
+
+    def test_role_change_invalidates_the_token(self):
+        operator = make_user("operator@example.com", role="operator")
+        client = self.client_for(operator)
+        # update() sends no signal: the cached state is trusted until it expires
+        User.objects.filter(pk=operator.pk).update(role="user")
+        self.assertEqual(client.get(reverse("report-history")).status_code, 200)
+
+        operator.role = "user"
+        operator.save()
+        self.assertEqual(client.get(reverse("report-history")).status_code, 401)
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.catalog import CATALOG_RECHECK_SECONDS, FoodCatalog
+from app.models import FoodItem
+
+
+def create_food(name, **fields):
+    return FoodItem.objects.create(
+        name=name, calories=100, protein_g=1, carbs_g=20, fats_g=1, sugar_g=1, fiber_g=1, **fields,
+    )
+
+
+class FoodCatalogTests(TestCase):
+    """
+    Writes whose version stamp bump this worker never sees, as with a
+    per-process cache or a write made by another process.
+    """
+
+    def setUp(self):
+        self.clock = mock.patch("app.catalog.clock.monotonic", return_value=1000.0).start()
+        mock.patch.object(FoodCatalog, "_current_version", return_value="stale").start()
+        self.addCleanup(mock.patch.stopall)
+        self.poha = create_food("Poha")
+        self.catalog = FoodCatalog()
+        self.catalog.get("poha")
+
+    def elapse(self, seconds):
+        self.clock.return_value += seconds
+
+    def test_unchanged_table_costs_one_query_per_recheck(self):
+        with self.assertNumQueries(0):
+            self.catalog.get("poha")
+        self.elapse(CATALOG_RECHECK_SECONDS)
+        with self.assertNumQueries(1):
+            self.catalog.get("poha")
+        with self.assertNumQueries(0):
+            self.catalog.get("poha")
+        self.assertEqual(self.catalog.loads, 1)
+
+    def test_changes_are_picked_up_after_the_recheck_interval(self):
+        FoodItem.objects.bulk_create([
+            FoodItem(name="Upma", calories=1, protein_g=1, carbs_g=1, fats_g=1, sugar_g=1, fiber_g=1),
+        ])
+        FoodItem.objects.filter(pk=self.poha.pk).update(calories=180, updated_at=timezone.now())
+
+        self.assertIsNone(self.catalog.get("upma"))
+        self.elapse(CATALOG_RECHECK_SECONDS)
+        self.assertIsNotNone(self.catalog.get("upma"))
+        self.assertEqual(self.catalog.get("poha").calories, 180)
+        self.assertEqual(self.catalog.loads, 2)
+
+    def test_deletes_are_picked_up(self):
+        self.poha.delete()
+
+        self.elapse(CATALOG_RECHECK_SECONDS)
+        self.assertIsNone(self.catalog.get("poha"))
@@ -0,0 +1,126 @@
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import DailyNutritionSummary, DiabeticProfile, FoodItem, NutritionistProfile, UserMeal, UserProfile
+from app.rollups import backfill_glycemic_load, glycemic_load_trends
+
+from .helpers import APITestCase, make_user
+
+
+class GlycemicLoadTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.rice = FoodItem.objects.create(
+            name="Rice", calories=130, protein_g=2.7, carbs_g=28, fats_g=0.3, sugar_g=0.1, fiber_g=0.4,
+            glycemic_index=73,
+        )
+        self.paneer = FoodItem.objects.create(
+            name="Paneer", calories=265, protein_g=18, carbs_g=1.2, fats_g=20, sugar_g=1.2, fiber_g=0,
+        )
+        self.patients = [make_user(f"patient{number}@example.com") for number in range(3)]
+        for number, patient in enumerate(self.patients):
+            profile = UserProfile.objects.create(
+                user=patient, name=f"Patient {number}", age=50, gender="male", height_cm=170, weight_kg=80,
+                activity_level="light", goal="maintain",
+            )
+            DiabeticProfile.objects.create(
+                user_profile=profile, hba1c=7.5, fasting_blood_sugar=140, diagnosis_date=self.today,
+            )
+
+    def log_meal(self, user, food, carbs, days_ago=0, glycemic_load=None):
+        """Logs a meal the way it was stored before glycemic load was filled in (None unless given)."""
+        return UserMeal.objects.create(
+            user=user, food_item=food, quantity=100, unit="g", meal_type="lunch", carbs=carbs,
+            glycemic_load=glycemic_load,
+            consumed_at=timezone.make_aware(datetime.combine(self.today - timedelta(days=days_ago), time(12))),
+        )
+
+    def test_backfill_fills_missing_loads_from_the_food(self):
+        missing = self.log_meal(self.patients[0], self.rice, carbs=50)
+        no_index = self.log_meal(self.patients[0], self.paneer, carbs=5)
+        no_carbs = self.log_meal(self.patients[0], self.rice, carbs=None)
+        stored = self.log_meal(self.patients[0], self.rice, carbs=50, glycemic_load=10)
+
+        self.assertEqual(backfill_glycemic_load(), 1)
+
+        loads = dict(UserMeal.objects.values_list("pk", "glycemic_load"))
+        self.assertAlmostEqual(loads[missing.pk], 36.5)
+        self.assertIsNone(loads[no_index.pk])
+        self.assertIsNone(loads[no_carbs.pk])
+        self.assertEqual(loads[stored.pk], 10)
+        self.assertEqual(backfill_glycemic_load(), 0)
+
+    def test_rebuild_command_backfills_into_the_rollup(self):
+        self.log_meal(self.patients[0], self.rice, carbs=50)
+        self.log_meal(self.patients[0], self.paneer, carbs=5)
+        summary = DailyNutritionSummary.objects.get(user=self.patients[0], date=self.today)
+        self.assertEqual(summary.glycemic_load, 0)
+
+        output = StringIO()
+        call_command("rebuild_nutrition_summaries", "--backfill-glycemic-load", stdout=output)
+
+        self.assertIn("Filled glycemic load on 1 meals.", output.getvalue())
+
+        summary = DailyNutritionSummary.objects.get(user=self.patients[0], date=self.today)
+        self.assertAlmostEqual(summary.glycemic_load, 36.5)
+        self.assertEqual(summary.meal_count, 2)
+
+    def test_trends(self):
+        first, second, _ = self.patients
+        self.log_meal(first, self.rice, carbs=50, days_ago=2, glycemic_load=36.5)
+        self.log_meal(first, self.rice, carbs=200, days_ago=1, glycemic_load=146)
+        self.log_meal(first, self.paneer, carbs=5, days_ago=1)
+        self.log_meal(second, self.paneer, carbs=5)
+        self.log_meal(second, self.rice, carbs=50, days_ago=30, glycemic_load=36.5)  # outside the range
+
+        trends = glycemic_load_trends([first.pk, second.pk], self.today - timedelta(days=13), self.today)
+
+        self.assertEqual(trends[first.pk], {
+            "average": 91.25,
+            "peak": 146,
+            "high_days": 1,  # 146 > HIGH_DAILY_GLYCEMIC_LOAD
+            "days_logged": 2,
+            "daily": [
+                {"date": self.today - timedelta(days=2), "glycemic_load": 36.5},
+                {"date": self.today - timedelta(days=1), "glycemic_load": 146},
+            ],
+        })
+        # A day of foods without a glycemic index counts as zero load
+        self.assertEqual(trends[second.pk], {
+            "average": 0, "peak": 0, "high_days": 0, "days_logged": 1,
+            "daily": [{"date": self.today, "glycemic_load": 0}],
+        })
+
+    def test_nutritionist_view(self):
+        first, second, unlogged = self.patients
+        self.log_meal(first, self.rice, carbs=50, glycemic_load=36.5)
+        self.log_meal(second, self.rice, carbs=200, glycemic_load=146)
+        nutritionist = make_user("nutritionist@example.com", role="nutritionist")
+        NutritionistProfile.objects.create(user=nutritionist).patients.set(self.patients)
+        client = self.client_for(nutritionist)
+
+        response = client.get(reverse("nutritionist-glycemic-load"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["from"], self.today - timedelta(days=13))
+        patients = response.data["patients"]
+        # Highest average first, patients without any logged day last
+        self.assertEqual([patient["user_id"] for patient in patients], [second.pk, first.pk, unlogged.pk])
+        self.assertEqual(patients[0]["daily"], [{"date": self.today, "glycemic_load": 146}])
+        self.assertEqual(patients[2]["average"], None)
+        self.assertEqual(patients[2]["days_logged"], 0)
+
+        response = client.get(reverse("nutritionist-glycemic-load"), {"daily": "false"})
+        self.assertNotIn("daily", response.data["patients"][0])
+
+    def test_nutritionist_view_rejects_bad_ranges(self):
+        nutritionist = make_user("nutritionist@example.com", role="nutritionist")
+        client = self.client_for(nutritionist)
+        for params in ({"from": "2025-02-01", "to": "2025-01-01"}, {"from": "2024-01-01", "to": "2025-01-01"}, {"to": "soon"}):
+            with self.subTest(params=params):
+                self.assertEqual(client.get(reverse("nutritionist-glycemic-load"), params).status_code, 400)
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+
+from app.models import FoodItem
+
+from .helpers import APITestCase
+
+
+def food(name, **fields):
+    return {
+        "name": name, "calories": 100, "protein_g": 1, "carbs_g": 20, "fats_g": 1, "sugar_g": 1, "fiber_g": 1,
+        **fields,
+    }
+
+
+class ImportFoodsTests(APITestCase):
+    def import_lines(self, lines, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as handle:
+            handle.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, handle.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_foods", handle.name, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_bad_jsonl_lines_are_reported_and_skipped(self):
+        stdout, stderr = self.import_lines([
+            json.dumps(food("Poha")),
+            '{"name": "Upma", "calories": ',
+            json.dumps([food("Idli")]),
+            json.dumps(food("Dosa", food_type="vegan")),
+            json.dumps(food("Vada", calories="lots")),
+        ], "--chunk-size", "2")
+
+        self.assertEqual(sorted(FoodItem.objects.values_list("name", flat=True)), ["Dosa", "Poha"])
+        self.assertIn("2 food items imported, 3 skipped, 5 rows", stdout)
+        self.assertEqual([line.split(":")[0] for line in stderr.splitlines()], ["Line 2", "Line 3", "Line 5"])
+        self.assertIn("expected a JSON object, got list", stderr)
+
+    def test_reimport_updates_by_name(self):
+        self.import_lines([json.dumps(food("Poha"))])
+        self.import_lines([json.dumps(food("  Poha ", calories=180))])
+
+        self.assertEqual(list(FoodItem.objects.values_list("name", "calories")), [("Poha", 180)])
+
+    def test_reimport_matches_names_case_insensitively(self):
+        self.import_lines([json.dumps(food("Poha"))])
+        self.import_lines([
+            json.dumps(food("poha", calories=180)),
+            json.dumps(food("UPMA")),
+            json.dumps(food("Upma", calories=90)),
+        ])
+
+        self.assertEqual(
+            list(FoodItem.objects.order_by("name").values_list("name", "calories")),
+            [("Poha", 180), ("Upma", 90)],
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            FoodItem.objects.create(**food("POHA"))
@@ -0,0 +1,45 @@
+from django.urls import reverse
+
+from app.models import FoodItem, UserMeal
+
+from .helpers import APITestCase, make_user
+
+
+class MealLoggingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        FoodItem.objects.create(
+            name="Rajma", calories=140, protein_g=8.7, carbs_g=22.8, fats_g=0.5, sugar_g=0.3, fiber_g=6.4,
+        )
+        self.patient = make_user("patient@example.com")
+        self.client = self.client_for(self.patient)
+
+    def log(self, data):
+        return self.client.post(reverse("user-meals-list"), data, format="json")
+
+    def test_unit_defaults_to_grams(self):
+        response = self.log({"food_name": "Rajma", "meal_type": "lunch", "quantity": 200})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data[0]["unit"], "g")
+        self.assertEqual(response.data[0]["calories"], 280)
+
+    def test_batch_mixing_units(self):
+        response = self.log([
+            {"food_name": "rajma", "meal_type": "lunch", "quantity": 100},
+            {"food_name": "Rajma", "meal_type": "dinner", "quantity": 1, "unit": "bowl"},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([meal["calories"] for meal in response.data], [140, 420])
+
+    def test_invalid_batch_saves_nothing(self):
+        response = self.log([
+            {"food_name": "Rajma", "meal_type": "lunch", "quantity": 100},
+            {"food_name": "Unobtainium", "meal_type": "lunch", "quantity": 100},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertIn("food_name", response.data["errors"][1])
+        self.assertFalse(UserMeal.objects.exists())
@@ -0,0 +1,74 @@
+import threading
+
+from asgiref.sync import iscoroutinefunction
+from django.http import JsonResponse
+from django.test import override_settings
+from django.urls import include, path, reverse
+from rest_framework.serializers import BaseSerializer
+
+from app.middleware import RequestMetricsMiddleware, request_metrics
+from app.models import PatientReminder, User
+
+from .helpers import APITestCase, make_user
+
+
+async def event_loop_thread_view(request):
+    return JsonResponse({"thread": threading.get_ident(), "users": await User.objects.acount()})
+
+
+urlpatterns = [
+    path("api/", include("app.urls")),
+    path("loop-thread/", event_loop_thread_view, name="loop-thread"),
+]
+
+
+def server_timing(response):
+    entries = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class RequestMetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        request_metrics.reset()
+        self.operator = make_user("operator@example.com", role="operator")
+
+    def test_server_timing_header(self):
+        response = self.client_for(self.operator).get(reverse("user-contacts"))
+
+        self.assertEqual(response.status_code, 200)
+        timing = server_timing(response)
+        self.assertEqual(set(timing), {"total", "db", "serializer", "render", "app"})
+        self.assertEqual(timing["db"]["desc"], '"1 queries"')
+
+    def test_serializer_time_is_recorded_per_view(self):
+        patient = make_user("patient@example.com")
+        PatientReminder.objects.bulk_create(PatientReminder(user=patient) for _ in range(50))
+        response = self.client_for(self.operator).get(reverse("reminder-list-create"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 50)
+        metrics = request_metrics.snapshot()["reminder-list-create"]
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["serializer_ms"]["max"], 0)
+
+    def test_drf_is_not_patched(self):
+        self.assertEqual(BaseSerializer.data.fget.__module__, "rest_framework.serializers")
+
+    def test_middleware_is_async_capable(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(RequestMetricsMiddleware(lambda request: None)))
+
+    async def test_async_views_run_on_the_event_loop(self):
+        response = await self.async_client.get("/loop-thread/")
+
+        # A sync-only middleware would run the view under async_to_sync in another thread
+        self.assertEqual(response.json()["thread"], threading.get_ident())
+        self.assertEqual(server_timing(response)["db"]["desc"], '"1 queries"')
@@ -0,0 +1,46 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.models import NutritionistProfile, UserProfile
+
+from .helpers import APITestCase, make_user
+
+
+class NutritionistDashboardPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        patients = [make_user(f"patient{number}@example.com") for number in range(7)]
+        for patient in patients:
+            UserProfile.objects.create(
+                user=patient, name="Asha", age=40, gender="female", height_cm=160, weight_kg=60,
+                activity_level="light", goal="maintain",
+            )
+        cls.patient_ids = sorted(patient.pk for patient in patients)
+        cls.nutritionist = make_user("nutritionist@example.com", role="nutritionist")
+        NutritionistProfile.objects.create(user=cls.nutritionist).patients.set(patients)
+
+    def walk(self, ordering):
+        """Follows the next links two patients at a time, returning the user ids in page order."""
+        client = self.client_for(self.nutritionist)
+        url = reverse("nutritionist-dashboard") + f"?ordering={ordering}&page_size=2"
+        ids = []
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [patient["user_id"] for patient in response.data["patients"]]
+            url = response.data["next"]
+        return ids
+
+    def test_ties_are_broken_by_id(self):
+        for ordering in ("age", "-age", "name", "weight_kg"):
+            with self.subTest(ordering=ordering):
+                with CaptureQueriesContext(connection) as queries:
+                    ids = self.walk(ordering)
+                self.assertEqual(sorted(ids), self.patient_ids)
+                order_by = [query["sql"] for query in queries if 'FROM "app_userprofile"' in query["sql"]]
+                for sql in order_by:
+                    self.assertRegex(sql, r'ORDER BY .*"app_userprofile"\."id" ASC')
+
+    def test_explicit_id_ordering_is_kept(self):
+        self.assertEqual(self.walk("-id"), sorted(self.patient_ids, reverse=True))
@@ -0,0 +1,155 @@
+import re
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models.functions import TruncDate
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.authentication import remember_account_state
+from app.models import FoodItem, NutritionistProfile, User, UserMeal, UserProfile
+from app.rollups import rebuild_summaries
+
+from .helpers import APITestCase, make_user
+
+PATIENTS = 200
+MEALS_PER_PATIENT = 100  # spread over the last year
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def full_scan_pattern(table):
+    if connection.vendor == "postgresql":
+        return rf"Seq Scan on {table}\b"
+    return rf"SCAN (TABLE )?{table}\b(?! USING)"
+
+
+class UserMealQueryPlanTests(APITestCase):
+    """
+    Seeds a large meal table and checks that the hot endpoints read UserMeal
+    and User through an index (EXPLAIN), within a fixed query budget.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.food = FoodItem.objects.create(
+            name="Rajma", calories=140, protein_g=8.7, carbs_g=22.8, fats_g=0.5, sugar_g=0.3, fiber_g=6.4,
+            glycemic_index=29,
+        )
+        patients = User.objects.bulk_create(
+            User(email=f"patient{number}@example.com", date_joined=now - timedelta(days=number))
+            for number in range(PATIENTS)
+        )
+        UserProfile.objects.bulk_create(
+            UserProfile(
+                user=patient, name=f"Patient {patient.pk}", age=40, gender="female", height_cm=160,
+                weight_kg=60, activity_level="light", goal="maintain", country="India",
+            )
+            for patient in patients
+        )
+        UserMeal.objects.bulk_create(
+            (
+                UserMeal(
+                    user=patient, food_item=cls.food, food_name=cls.food.name, quantity=100, unit="g",
+                    meal_type="lunch", calories=140, protein=8.7, carbs=22.8, fats=0.5, sugar=0.3, fiber=6.4,
+                    consumed_at=now - timedelta(days=meal * 365 // MEALS_PER_PATIENT, minutes=patient.pk),
+                )
+                for patient in patients
+                for meal in range(MEALS_PER_PATIENT)
+            ),
+            batch_size=2000,
+        )
+        # `date` is auto_now_add, so bulk_create stamped today on every row
+        UserMeal.objects.update(date=TruncDate("consumed_at"))
+        rebuild_summaries()
+
+        cls.patient = patients[0]
+        cls.nutritionist = make_user("nutritionist@example.com", role="nutritionist")
+        NutritionistProfile.objects.create(user=cls.nutritionist).patients.set(patients[:60])
+        cls.owner = make_user("owner@example.com", role="owner")
+        cls.operator = make_user("operator@example.com", role="operator")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def request(self, user, method, url_name, *args, budget, **kwargs):
+        """
+        Sends a request and checks its query count (account state already
+        cached, as on any request but a user's first), returning the response
+        and the queries.
+        """
+        client = self.client_for(user)
+        remember_account_state(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, method)(reverse(url_name, args=args), **kwargs)
+        self.assertLess(response.status_code, 400, getattr(response, "data", response.content))
+        self.assertLessEqual(len(queries), budget, "\n".join(query["sql"] for query in queries))
+        return response, queries
+
+    def assertIndexScans(self, queries, table, index=None):
+        """Every SELECT reading `table` uses an index (`index`, if given) and never scans the table."""
+        selects = [
+            query["sql"] for query in queries
+            if query["sql"].startswith("SELECT") and re.search(rf'FROM "{table}"|JOIN "{table}"', query["sql"])
+        ]
+        self.assertTrue(selects, f"no query reads {table}")
+        for sql in selects:
+            plan = query_plan(sql)
+            self.assertNotRegex(plan, full_scan_pattern(table), f"{sql}\n{plan}")
+            if index:
+                self.assertIn(index, plan, f"{sql}\n{plan}")
+
+    def test_meal_list(self):
+        response, queries = self.request(self.patient, "get", "user-meals-list", budget=1)
+        self.assertEqual(len(response.data), MEALS_PER_PATIENT)
+        self.assertIndexScans(queries, "app_usermeal")
+
+    def test_meal_update_rebuilds_its_day_from_an_index_range(self):
+        meal = UserMeal.objects.filter(user=self.patient).first()
+        _, queries = self.request(
+            self.patient, "patch", "user-meals-detail", meal.pk, data={"quantity": 150}, format="json", budget=8,
+        )
+        self.assertIndexScans(queries, "app_usermeal")
+        rebuild = [query for query in queries if "SUM(" in query["sql"] and '"app_usermeal"' in query["sql"]]
+        self.assertIndexScans(rebuild, "app_usermeal", index="usermeal_user_consumed_idx")
+
+    def test_meal_batch_insert_has_a_fixed_query_count(self):
+        # Catalog load, INSERT and rollup UPDATE, plus the savepoint pair, whatever the batch size
+        for size in (1, 50):
+            meals = [{"food_name": "rajma", "meal_type": "lunch", "quantity": 1, "unit": "bowl"}] * size
+            with self.subTest(size=size):
+                self.food.save()  # makes every batch load the catalog
+                response, _ = self.request(
+                    self.patient, "post", "user-meals-list", data=meals, format="json", budget=5,
+                )
+                self.assertEqual(len(response.data), size)
+
+    def test_daily_summary(self):
+        _, queries = self.request(self.patient, "get", "daily_calorie_summary", budget=2)
+        self.assertIndexScans(queries, "app_dailynutritionsummary")
+
+    def test_nutrition_trend(self):
+        _, queries = self.request(self.patient, "get", "nutrition-trend", budget=1)
+        self.assertIndexScans(queries, "app_dailynutritionsummary")
+
+    def test_owner_dashboard(self):
+        _, queries = self.request(self.owner, "get", "owner-dashboard", budget=3)
+        self.assertIndexScans(queries, "app_usermeal", index="usermeal_date_user_idx")
+        self.assertIndexScans(queries, "app_user", index="user_role_joined_idx")
+
+    def test_nutritionist_dashboard(self):
+        response, queries = self.request(self.nutritionist, "get", "nutritionist-dashboard", budget=2)
+        self.assertEqual(len(response.data["patients"]), 50)
+        self.assertIndexScans(queries, "app_dailynutritionsummary")
+
+    def test_operator_contacts(self):
+        response, _ = self.request(self.operator, "get", "user-contacts", budget=1)
+        self.assertEqual(len(response.data["results"]), PATIENTS)
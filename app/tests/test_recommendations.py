@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.urls import reverse
+from django.utils.timezone import localdate
+
+from app.catalog import food_catalog
+from app.models import FoodItem, UserProfile
+from app.recommendations import RecommendationIndex, recommend_foods
+
+from .helpers import APITestCase, make_user
+
+
+class FoodRecommendationTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            FoodItem.objects.create(
+                name=f"Dal {i}", calories=100 + 20 * i, protein_g=6, carbs_g=15, fats_g=2, sugar_g=1, fiber_g=4,
+                food_type="vegetarian",
+            )
+        self.patient = make_user("patient@example.com")
+        UserProfile.objects.create(
+            user=self.patient, name="Patient", age=30, gender="female", height_cm=160, weight_kg=60,
+            activity_level="moderate", goal="maintain", diet_type="vegetarian",
+        )
+        self.client = self.client_for(self.patient)
+
+    def recommend(self, **params):
+        return self.client.get(reverse("food_recommendations"), params)
+
+    def test_limit(self):
+        response = self.recommend(limit=2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["suggestions"]), 2)
+
+    def test_invalid_limit(self):
+        for limit in ("-3", "0", "ten"):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.recommend(limit=limit).status_code, 400)
+
+    def test_cached_suggestions_are_dropped_when_the_catalog_reloads(self):
+        today = localdate()
+        recommend_foods(self.patient.id, today)
+        version = food_catalog.version()
+
+        with mock.patch.object(RecommendationIndex, "recommend", autospec=True, return_value=[]) as recommend:
+            recommend_foods(self.patient.id, today)
+            self.assertEqual(recommend.call_count, 0)
+
+            FoodItem.objects.filter(name="Dal 0").update(calories=90)
+            food_catalog.invalidate()
+            _, suggestions = recommend_foods(self.patient.id, today)
+            self.assertEqual(recommend.call_count, 1)
+            self.assertEqual(suggestions, [])
+        self.assertNotEqual(food_catalog.version(), version)
@@ -0,0 +1,227 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils.timezone import now
+from django.urls import reverse
+
+from app.models import DiabeticProfile, PatientReminder, UserProfile
+from app.reminders import CLAIM_TIMEOUT, MAX_SEND_ATTEMPTS, create_campaign, dispatch_queued, enqueue_reminders
+
+from .helpers import APITestCase, make_user
+
+
+class ReminderListTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.patient = make_user("patient@example.com")
+        self.other = make_user("other@example.com")
+        PatientReminder.objects.create(user=self.patient, title="Walk", recurrence="daily")
+        PatientReminder.objects.create(user=self.other, title="Water")
+        self.client = self.client_for(make_user("operator@example.com", role="operator"))
+
+    def list(self, **params):
+        return self.client.get(reverse("reminder-list-create"), params)
+
+    def test_filters(self):
+        response = self.list(user=self.patient.pk)
+        self.assertEqual([reminder["title"] for reminder in response.data["results"]], ["Walk"])
+
+        response = self.list(recurrence="none")
+        self.assertEqual([reminder["title"] for reminder in response.data["results"]], ["Water"])
+
+    def test_invalid_filters_are_rejected(self):
+        for params, field in (({"user": "abc"}, "user"), ({"recurrence": "hourly"}, "recurrence")):
+            with self.subTest(params=params):
+                response = self.list(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
+
+
+class ReminderCampaignTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.operator = make_user("operator@example.com", role="operator")
+        self.client = self.client_for(self.operator)
+
+    def patient(self, email, country="India", hba1c=None, **fields):
+        user = make_user(email, **fields)
+        profile = UserProfile.objects.create(
+            user=user, name=email, age=50, gender="female", height_cm=160, weight_kg=70,
+            activity_level="light", goal="maintain", country=country,
+        )
+        if hba1c is not None:
+            DiabeticProfile.objects.create(
+                user_profile=profile, hba1c=hba1c, fasting_blood_sugar=130, diagnosis_date=now().date(),
+            )
+        return user
+
+    def test_audience(self):
+        target = self.patient("target@example.com", hba1c=9)
+        self.patient("controlled@example.com", hba1c=7)
+        healthy = self.patient("healthy@example.com")
+        self.patient("abroad@example.com", country="Nepal", hba1c=9)
+        self.patient("inactive@example.com", hba1c=9, is_active=False)
+        self.patient("nutritionist@example.com", hba1c=9, role="nutritionist")
+
+        for audience, expected in (
+            ({"country": "India", "diabetic": True, "min_hba1c": 8}, [target]),
+            ({"country": "India", "diabetic": False}, [healthy]),
+        ):
+            with self.subTest(audience=audience):
+                PatientReminder.objects.all().delete()
+                response = self.client.post(
+                    reverse("reminder-campaign"),
+                    {"title": "Check your sugar", "message": "Book an HbA1c test.", "audience": audience},
+                    format="json",
+                )
+
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(response.data, {"created": len(expected)})
+                reminders = PatientReminder.objects.all()
+                self.assertEqual([reminder.user for reminder in reminders], expected)
+                self.assertEqual(reminders[0].created_by, self.operator)
+                self.assertEqual(reminders[0].title, "Check your sugar")
+
+    def test_reminders_are_created_in_chunks(self):
+        patients = [self.patient(f"patient{i}@example.com") for i in range(5)]
+        self.patient("inactive@example.com", is_active=False)
+
+        with mock.patch.object(
+            PatientReminder.objects, "bulk_create", wraps=PatientReminder.objects.bulk_create
+        ) as bulk_create:
+            created = create_campaign({"country": "India"}, chunk_size=2, title="Walk")
+
+        self.assertEqual(created, 5)
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [2, 2, 1])
+        self.assertEqual(
+            sorted(PatientReminder.objects.values_list("user_id", flat=True)), [patient.pk for patient in patients]
+        )
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class ReminderDispatchTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.patients = [make_user(f"patient{i}@example.com") for i in range(5)]
+        self.reminders = [
+            PatientReminder.objects.create(user=patient, title="Log your lunch", message="Don't forget.")
+            for patient in self.patients
+        ]
+        self.client = self.client_for(make_user("operator@example.com", role="operator"))
+
+    def dispatch(self, **options):
+        out = StringIO()
+        call_command("dispatch_reminders", stdout=out, **options)
+        return out.getvalue()
+
+    def test_send_view_only_queues(self):
+        reminder = self.reminders[0]
+        response = self.client.post(reverse("send-reminder", args=[reminder.pk]))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(mail.outbox, [])
+        reminder.refresh_from_db()
+        self.assertIsNotNone(reminder.queued_at)
+        self.assertIsNone(reminder.sent_at)
+
+    def test_queued_reminders_are_sent_in_batches(self):
+        response = self.client.post(
+            reverse("bulk-send-reminders"), {"ids": [r.pk for r in self.reminders]}, format="json",
+        )
+        self.assertEqual(response.data, {"queued": 5})
+
+        self.assertIn("Sent 5, 0 failed.", self.dispatch(batch_size=2))
+
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            [patient.email for patient in self.patients],
+        )
+        self.assertEqual(mail.outbox[0].subject, "Log your lunch")
+        self.assertFalse(PatientReminder.objects.filter(sent_at=None).exists())
+        self.assertFalse(PatientReminder.objects.exclude(queued_at=None).exists())
+
+        # Sent reminders are neither queued nor sent again
+        response = self.client.post(reverse("send-reminder", args=[self.reminders[0].pk]))
+        self.assertEqual(response.data, {"status": "Reminder was already sent or queued."})
+        self.assertIn("Sent 0, 0 failed.", self.dispatch())
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_sending_a_recurring_reminder_creates_the_next_one(self):
+        reminder = self.reminders[0]
+        PatientReminder.objects.filter(pk=reminder.pk).update(recurrence="daily")
+        enqueue_reminders(PatientReminder.objects.filter(pk=reminder.pk))
+
+        self.assertEqual(dispatch_queued(), {"sent": 1, "failed": 0})
+
+        follow_up = PatientReminder.objects.get(user=self.patients[0], sent_at=None)
+        self.assertEqual(follow_up.recurrence, "daily")
+        self.assertEqual(follow_up.date, reminder.date + timedelta(days=1))
+
+    def test_failures_are_retried_up_to_max_send_attempts(self):
+        enqueue_reminders(PatientReminder.objects.all())
+        failing = self.patients[0].email
+        send = EmailMessage.send
+
+        def send_or_fail(message, *args, **kwargs):
+            if message.to == [failing]:
+                raise SMTPException("mailbox unavailable")
+            return send(message, *args, **kwargs)
+
+        with mock.patch.object(EmailMessage, "send", autospec=True, side_effect=send_or_fail):
+            # A failing message does not stop the rest of the batch
+            self.assertEqual(dispatch_queued(batch_size=2), {"sent": 4, "failed": 1})
+            for _ in range(MAX_SEND_ATTEMPTS - 1):
+                self.assertEqual(dispatch_queued(), {"sent": 0, "failed": 1})
+            # Given up on: still queued and unsent, but no longer picked up
+            self.assertEqual(dispatch_queued(), {"sent": 0, "failed": 0})
+
+        self.assertEqual(len(mail.outbox), 4)
+        reminder = PatientReminder.objects.get(user=self.patients[0])
+        self.assertEqual(reminder.attempts, MAX_SEND_ATTEMPTS)
+        self.assertIn("mailbox unavailable", reminder.last_error)
+        self.assertIsNone(reminder.sent_at)
+
+        # Queuing it again does not lift the limit
+        response = self.client.post(reverse("bulk-send-reminders"), {"all_due": True}, format="json")
+        self.assertEqual(response.data, {"queued": 0})
+        self.assertEqual(dispatch_queued(), {"sent": 0, "failed": 0})
+        self.assertEqual(PatientReminder.objects.get(pk=reminder.pk).attempts, MAX_SEND_ATTEMPTS)
+
+    def test_claimed_reminders_are_skipped_until_the_claim_expires(self):
+        enqueue_reminders(PatientReminder.objects.all())
+        PatientReminder.objects.filter(pk=self.reminders[0].pk).update(claimed_at=now())
+        PatientReminder.objects.filter(pk=self.reminders[1].pk).update(
+            claimed_at=now() - CLAIM_TIMEOUT - timedelta(minutes=1),
+        )
+
+        self.assertEqual(dispatch_queued(), {"sent": 4, "failed": 0})
+        self.assertEqual(PatientReminder.objects.get(sent_at=None, queued_at__isnull=False).pk, self.reminders[0].pk)
+        self.assertFalse(PatientReminder.objects.filter(sent_at__isnull=False).exclude(claimed_at=None).exists())
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class ReminderDispatchLockingTests(TransactionTestCase):
+    def test_mail_is_sent_after_the_claim_commits(self):
+        patient = make_user("patient@example.com")
+        reminder = PatientReminder.objects.create(user=patient, title="Walk")
+        enqueue_reminders(PatientReminder.objects.all())
+        send = EmailMessage.send
+        seen = []
+
+        def send_outside_transaction(message, *args, **kwargs):
+            seen.append((connection.in_atomic_block, PatientReminder.objects.get(pk=reminder.pk).claimed_at))
+            return send(message, *args, **kwargs)
+
+        with mock.patch.object(EmailMessage, "send", autospec=True, side_effect=send_outside_transaction):
+            self.assertEqual(dispatch_queued(), {"sent": 1, "failed": 0})
+
+        [(in_transaction, claimed_at)] = seen
+        self.assertFalse(in_transaction)
+        self.assertIsNotNone(claimed_at)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.timezone import localdate, now
+
+from app.caching import response_cache_stats
+from app.models import AppReport, PatientReminder, UserMeal
+from app.reports import ACTIVE_WINDOW_DAYS
+from app.rollups import day_bounds
+
+from .helpers import APITestCase, make_user
+
+
+class OperatorReportTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(make_user("operator@example.com", role="operator"))
+
+    def report(self):
+        response = self.client.get(reverse("operator-report"))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_report_is_live(self):
+        self.assertEqual(self.report()["reminders_sent"], 0)
+
+        PatientReminder.objects.create(user=make_user("patient@example.com"), sent_at=now())
+        self.assertEqual(self.report()["reminders_sent"], 1)
+
+    def test_response_cache_stats_exclude_the_report(self):
+        before = response_cache_stats.stats()["views"]
+        self.report()
+        self.assertEqual(self.report()["response_cache"]["views"], before)
+
+
+class AppReportTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.day = localdate() - timedelta(days=20)
+
+    def days(self, offset):
+        return self.day + timedelta(days=offset)
+
+    def join(self, email, offset):
+        return make_user(email, date_joined=day_bounds(self.days(offset))[0] + timedelta(hours=12))
+
+    def log_meal(self, user, offset):
+        meal = UserMeal.objects.create(
+            user=user, food_name="Rajma", quantity=100, unit="g", meal_type="lunch",
+            calories=140, protein=8.7, carbs=22.8, fats=0.5, sugar=0.3, fiber=6.4,
+            consumed_at=day_bounds(self.days(offset))[0] + timedelta(hours=13),
+        )
+        UserMeal.objects.filter(pk=meal.pk).update(date=self.days(offset))  # auto_now_add
+
+    def generate(self, since, until):
+        out = StringIO()
+        call_command("generate_app_reports", since=str(self.days(since)), until=str(self.days(until)), stdout=out)
+        return out.getvalue()
+
+    def report(self, offset):
+        return AppReport.objects.get(report_date=self.days(offset))
+
+    def test_total_users_continue_from_the_previous_snapshot(self):
+        self.join("early@example.com", -5)
+        self.generate(0, 1)
+        self.assertEqual(self.report(1).total_users, 1)
+
+        # The next run starts from the stored total instead of recounting
+        AppReport.objects.filter(report_date=self.days(1)).update(total_users=100)
+        self.join("new@example.com", 2)
+        self.generate(2, 3)
+        self.assertEqual((self.report(2).total_users, self.report(2).new_users), (101, 1))
+        self.assertEqual(self.report(3).total_users, 101)
+
+    def test_active_patients_slide_over_the_window(self):
+        patient = self.join("patient@example.com", -5)
+        self.log_meal(patient, 0)
+        self.log_meal(patient, 2)
+        self.generate(0, ACTIVE_WINDOW_DAYS + 2)
+
+        active = [self.report(offset).active_patients for offset in range(ACTIVE_WINDOW_DAYS + 3)]
+        self.assertEqual(active, [1] * (ACTIVE_WINDOW_DAYS + 2) + [0])
+        self.assertEqual([self.report(offset).meals_logged for offset in range(4)], [1, 0, 1, 0])
+
+    def test_rerun_updates_the_snapshots_in_place(self):
+        patient = self.join("patient@example.com", -5)
+        self.assertIn("Wrote 3 report(s)", self.generate(0, 2))
+        self.log_meal(patient, 1)
+
+        self.generate(0, 2)
+        self.assertEqual(AppReport.objects.count(), 3)
+        self.assertEqual(self.report(1).meals_logged, 1)
+
+    def test_history_rejects_days_below_one(self):
+        client = self.client_for(make_user("owner@example.com", role="owner"))
+        for days in ("-3", "0"):
+            with self.subTest(days=days):
+                self.assertEqual(client.get(reverse("report-history"), {"days": days}).status_code, 400)
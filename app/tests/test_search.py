@@ -0,0 +1,95 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from app.models import FoodItem
+from app.search import FoodSearchIndex
+
+from .helpers import APITestCase, make_user
+
+FOODS = [
+    ("Paneer", "vegetarian"),
+    ("Paneer Tikka", "vegetarian"),
+    ("Palak Paneer", "vegetarian"),
+    ("Chicken Biryani", "non_vegetarian"),
+    ("Chicken Tikka", "non_vegetarian"),
+    ("Veg Biryani", "vegetarian"),
+    ("Masala Dosa", "vegetarian"),
+]
+
+
+class FoodSearchIndexTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = FoodSearchIndex([
+            FoodItem(id=i, name=name, food_type=food_type) for i, (name, food_type) in enumerate(FOODS)
+        ])
+
+    def names(self, query, **kwargs):
+        return [item.name for item, _ in self.index.search(query, **kwargs)]
+
+    def test_prefix_ranking(self):
+        self.assertEqual(self.names("paneer"), ["Paneer", "Paneer Tikka", "Palak Paneer"])
+        self.assertEqual(self.names("tik"), ["Paneer Tikka", "Chicken Tikka"])
+
+    def test_typo_in_one_word_of_the_name(self):
+        for query in ("panir", "panner"):
+            with self.subTest(query=query):
+                names = self.names(query)
+                self.assertEqual(names[0], "Paneer")
+                self.assertIn("Paneer Tikka", names)
+                self.assertIn("Palak Paneer", names)
+        self.assertEqual(set(self.names("biryni")), {"Chicken Biryani", "Veg Biryani"})
+
+    def test_typo_in_the_whole_name(self):
+        self.assertEqual(self.names("paneer tika")[0], "Paneer Tikka")
+
+    def test_filters(self):
+        self.assertEqual(self.names("biryni", food_type="vegetarian"), ["Veg Biryani"])
+        self.assertEqual(self.names("chicken", food_type="vegetarian"), [])
+
+    def test_filters_apply_before_the_fuzzy_fallback(self):
+        index = FoodSearchIndex([
+            *(FoodItem(id=i, name=f"Chicken Curry {i}", food_type="non_vegetarian") for i in range(20)),
+            FoodItem(id=20, name="Chiken Veg Substitute", food_type="vegetarian"),
+        ])
+
+        results = index.search("chicken", food_type="vegetarian")
+        self.assertEqual([item.name for item, _ in results], ["Chiken Veg Substitute"])
+
+    def test_filters_apply_before_the_prefix_scan_limit(self):
+        index = FoodSearchIndex([
+            *(FoodItem(id=i, name=f"Aa {i:04d}", food_type="non_vegetarian") for i in range(2000)),
+            FoodItem(id=2000, name="Aaloo Tikki", food_type="vegetarian"),
+        ])
+
+        results = index.search("aa", food_type="vegetarian")
+        self.assertEqual([item.name for item, _ in results], ["Aaloo Tikki"])
+
+    def test_limit(self):
+        self.assertEqual(len(self.names("panir", limit=2)), 2)
+        self.assertEqual(self.names("panir", limit=0), [])
+
+
+class FoodSearchViewTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        for name, food_type in FOODS:
+            FoodItem.objects.create(
+                name=name, calories=100, protein_g=5, carbs_g=10, fats_g=5, sugar_g=1, fiber_g=2, food_type=food_type,
+            )
+        self.client = self.client_for(make_user("patient@example.com"))
+
+    def search(self, **params):
+        return self.client.get(reverse("food-search"), params)
+
+    def test_limit(self):
+        response = self.search(q="panir", limit=2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([food["name"] for food in response.data["results"]], ["Paneer", "Palak Paneer"])
+
+    def test_invalid_limit(self):
+        for limit in ("-3", "0", "ten"):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.search(q="panir", limit=limit).status_code, 400)
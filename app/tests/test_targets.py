@@ -0,0 +1,105 @@
+from itertools import product
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from app.models import UserProfile
+from app.targets import calculate_calorie_targets, calorie_target_key, get_calorie_target
+from utils.utils import ACTIVITY_MULTIPLIERS, GOAL_ADJUSTMENTS, calculate_calorie_target
+
+from .helpers import APITestCase, make_user
+
+
+class CalorieTargetCacheTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user("patient@example.com")
+        self.profile = UserProfile.objects.create(
+            user=self.user, name="Asha", age=40, gender="female", height_cm=160, weight_kg=60,
+            activity_level="light", goal="maintain", country="India",
+        )
+
+    def expected(self):
+        profile = self.profile
+        return calculate_calorie_target(
+            weight=profile.weight_kg, height=profile.height_cm, age=profile.age, gender=profile.gender,
+            activity_level=profile.activity_level, goal=profile.goal,
+        )
+
+    def test_reused_while_the_profile_is_unchanged(self):
+        self.assertEqual(get_calorie_target(self.user.pk), self.expected())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_calorie_target(self.user.pk), self.expected())
+
+        # Saving fields the target does not depend on keeps the entry
+        self.profile.country = "Nepal"
+        self.profile.mobile_number = "9800000000"
+        self.profile.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_calorie_target(self.user.pk), self.expected())
+
+    def test_recomputed_when_a_target_field_changes(self):
+        changes = {
+            "weight_kg": 72, "height_cm": 170, "age": 55, "gender": "male",
+            "activity_level": "active", "goal": "lose_weight",
+        }
+        for field, value in changes.items():
+            with self.subTest(field=field):
+                before = get_calorie_target(self.user.pk)
+                setattr(self.profile, field, value)
+                self.profile.save()
+
+                with self.assertNumQueries(1):
+                    after = get_calorie_target(self.user.pk)
+                self.assertEqual(after, self.expected())
+                self.assertNotEqual(after, before)
+
+    def test_dropped_with_the_profile(self):
+        get_calorie_target(self.user.pk)
+        self.profile.delete()
+
+        self.assertIsNone(cache.get(calorie_target_key(self.user.pk)))
+        with self.assertRaises(UserProfile.DoesNotExist):
+            get_calorie_target(self.user.pk)
+
+
+class CalculateCalorieTargetsTests(SimpleTestCase):
+    def scalar(self, row):
+        return calculate_calorie_target(
+            weight=row["weight_kg"], height=row["height_cm"], age=row["age"], gender=row["gender"],
+            activity_level=row["activity_level"], goal=row["goal"],
+        )
+
+    def test_matches_the_single_user_formula(self):
+        rows = [
+            {
+                "user_id": user_id, "weight_kg": weight, "height_cm": height, "age": age, "gender": gender,
+                "activity_level": activity_level, "goal": goal,
+            }
+            for user_id, (weight, height, age, gender, activity_level, goal) in enumerate(product(
+                (48, 60.4, 95.25), (152, 162, 166, 181.3), (19, 40, 73), ("male", "female"),
+                (*ACTIVITY_MULTIPLIERS, "unknown"), (*GOAL_ADJUSTMENTS, "maintain"),
+            ))
+        ]
+
+        targets = calculate_calorie_targets(rows)
+
+        self.assertEqual(len(targets), len(rows))
+        for row in rows:
+            self.assertEqual(targets[row["user_id"]], self.scalar(row), row)
+
+    def test_halves_round_to_even(self):
+        # Python's round() and np.rint both round exact halves to the even
+        # neighbour; a BMR of 1251.5 gives 1252 and 1276.5 gives 1276
+        for height, bmr in ((162, 1252), (166, 1276)):
+            row = {
+                "user_id": 1, "weight_kg": 60, "height_cm": height, "age": 40, "gender": "female",
+                "activity_level": "sedentary", "goal": "maintain",
+            }
+            with self.subTest(height=height):
+                self.assertEqual(calculate_calorie_targets([row])[1]["bmr"], bmr)
+                self.assertEqual(self.scalar(row)["bmr"], bmr)
+
+    def test_no_profiles(self):
+        self.assertEqual(calculate_calorie_targets([]), {})
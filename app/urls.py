@@ -1,16 +1,18 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 from django.urls import include
+from . import async_views
 from .views import (
     RegisterView, UserProfileDetailView, UserProfileCreateView,home,
     DiabeticProfileCreateView,DiabeticProfileDetailView,
-    UserMealViewSet,
-    OwnerDashboardView, NutritionistDashboardView,
-    recommend_calories, DailyCalorieSummaryView,
-    ReminderListCreateView,
-    SendReminderView,
+    UserMealViewSet, FoodSearchView,
+    OwnerDashboardView, NutritionistDashboardView, NutritionistCalorieTargetsView, NutritionistGlycemicLoadView,
+    ReportHistoryView,
+    recommend_calories, FoodRecommendationView, DailyCalorieSummaryView, NutritionTrendView,
+    ReminderListCreateView, ReminderCampaignView,
+    SendReminderView, BulkSendReminderView,
     UserContactListView,
-    OperatorReportView,
+    OperatorReportView, OperatorMetricsView,
     
 )
 from rest_framework_simplejwt.views import (
@@ -53,12 +55,16 @@ urlpatterns = [
     # Get, update, or delete diabetic profile
     path('diabetic/', DiabeticProfileDetailView.as_view(), name='diabetic-profile'),
 
-   
+    # Typo-tolerant food search / autocomplete
+    path('foods/search/', FoodSearchView.as_view(), name='food-search'),
 
     # #Calorie recommendation endpoint
     path('recommend-calories/', recommend_calories, name='recommend_calories'),
+    path('recommendations/', FoodRecommendationView.as_view(), name='food_recommendations'),
     ######calorie tracking ########
     path('daily-calorie-summary/', DailyCalorieSummaryView.as_view(), name='daily_calorie_summary'),
+    # Nutrient totals per day/week/month with rolling averages
+    path('nutrition/trend/', NutritionTrendView.as_view(), name='nutrition-trend'),
 
  
 
@@ -67,21 +73,40 @@ urlpatterns = [
     ####################### ACTORS IN SYSTEM #######################
     path('owner/', OwnerDashboardView.as_view(), name='owner-dashboard'),
     path("nutritionist/", NutritionistDashboardView.as_view(), name="nutritionist-dashboard"),
+    path("nutritionist/calorie-targets/", NutritionistCalorieTargetsView.as_view(), name="nutritionist-calorie-targets"),
+    path("nutritionist/glycemic-load/", NutritionistGlycemicLoadView.as_view(), name="nutritionist-glycemic-load"),
+    # Owner/Operator - daily report snapshots
+    path("reports/history/", ReportHistoryView.as_view(), name="report-history"),
 
 
     ########################Operator APIs########################
     # Operator - Create or List patient reminders
     path("operator/reminders/", ReminderListCreateView.as_view(), name="reminder-list-create"),
+
+    # Operator - Create one reminder for every patient matching an audience filter
+    path("operator/reminders/campaign/", ReminderCampaignView.as_view(), name="reminder-campaign"),
     
-    # Operator - Manually send reminder email to a patient
+    # Operator - Queue one reminder email to a patient
     path("operator/reminders/send/<int:pk>/", SendReminderView.as_view(), name="send-reminder"),        
+
+    # Operator - Queue many reminders (by id, or every due one) for the dispatch worker
+    path("operator/reminders/send/", BulkSendReminderView.as_view(), name="bulk-send-reminders"),
     
     # Operator - View all users' contact details
     path("operator/users/contacts/", UserContactListView.as_view(), name="user-contacts"),
     
     # Operator - Generate basic user and reminder reports
     path("operator/reports/", OperatorReportView.as_view(), name="operator-report"),
+
+    # Operator - Per-view request timings and cache hit rates
+    path("operator/metrics/", OperatorMetricsView.as_view(), name="operator-metrics"),
     ##################################################################################################
+
+    # Async (ASGI) versions of the hot read endpoints
+    path("async/daily-calorie-summary/", async_views.daily_calorie_summary, name="async-daily-calorie-summary"),
+    path("async/recommend-calories/", async_views.recommend_calories, name="async-recommend-calories"),
+    path("async/owner/", async_views.owner_dashboard, name="async-owner-dashboard"),
+    path("async/operator/reports/", async_views.operator_report, name="async-operator-report"),
 ]
         
 
@@ -1,22 +1,38 @@
 from django.shortcuts import render, HttpResponse
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Sum
-from django.db.models import Count
+from django.db.models import F, OuterRef, Subquery
+from django.db import transaction
 from rest_framework.exceptions import ValidationError   
-from utils.utils import UNIT_TO_GRAMS,role_required
-from datetime import datetime, time
+from utils.utils import role_required
+from datetime import date
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import viewsets
 from datetime import timedelta
-from django.utils.timezone import now
-from django.core.mail import send_mail
+from itertools import chain
+import csv
+import json
+from django.utils.timezone import now, localdate
 from rest_framework import status
-from rest_framework import generics, permissions
-from .models import User, UserProfile, DiabeticProfile,UserMeal,FoodItem,PatientReminder
-from .serializers import RegisterSerializer, UserProfileSerializer,DiabeticProfileSerializer,UserMealSerializer,PatientReminderSerializer
-from django.http import HttpResponseForbidden
+from rest_framework import filters, generics, permissions
+from .models import User, UserProfile, DiabeticProfile,UserMeal,PatientReminder,DailyNutritionSummary,AppReport
+from .caching import cache_response, response_cache_stats
+from .catalog import food_catalog, normalize_food_name
+from .dashboard import OWNER_PROMOTIONS, get_owner_metrics
+from .middleware import request_metrics
+from .pagination import ContactCursorPagination, PatientCursorPagination, ReminderCursorPagination
+from .recommendations import MAX_RECOMMENDATIONS, recommend_foods, recommendation_cache
+from .reminders import create_campaign, enqueue_reminders
+from .routers import ReplicaReadMixin
+from .signals import meals_changed
+from .rollups import HIGH_DAILY_GLYCEMIC_LOAD, SUMMARY_FIELDS, TREND_BUCKETS, add_meals, glycemic_load_trends, nutrition_trend
+from .serializers import RegisterSerializer, UserProfileSerializer,DiabeticProfileSerializer,UserMealSerializer,PatientReminderSerializer,FoodItemSerializer,AppReportSerializer,NutritionistPatientSerializer,ReminderCampaignSerializer,PatientIdsSerializer
+from .targets import TARGET_FIELDS, calculate_calorie_targets, get_calorie_target
+from django.http import HttpResponseForbidden, StreamingHttpResponse
+
+# Upper bound on how many meals a client can log in one request
+MAX_MEAL_BATCH_SIZE = 500
 
 # Create your views here.
 
@@ -110,201 +126,383 @@ class UserMealViewSet(viewsets.ModelViewSet):
         return UserMeal.objects.filter(user=self.request.user)
 
     def create(self, request, *args, **kwargs):
+        """
+        Logs one meal or a whole batch of meals in a single request.
+        - The batch is validated up front and every food name is resolved in one query.
+        - All rows are inserted with one bulk INSERT inside a transaction, so either
+          the whole batch is saved or nothing is.
+        - On failure a 400 is returned with one error entry per submitted item
+          (an empty dict for items that were fine).
+        """
         user = request.user
         data = request.data
 
         if isinstance(data, dict):  # Single object
             data = [data]
 
-        response_data = []
-
-        for item in data:
-            serializer = self.get_serializer(data=item)
-            serializer.is_valid(raise_exception=True)
+        if not isinstance(data, list) or not data:
+            raise ValidationError("Expected a meal object or a non-empty list of meals.")
+        if len(data) > MAX_MEAL_BATCH_SIZE:
+            raise ValidationError(f"A batch can contain at most {MAX_MEAL_BATCH_SIZE} meals.")
+
+        # Validate the whole batch before touching the database
+        serializers = [self.get_serializer(data=item) for item in data]
+        errors = []
+        for serializer in serializers:
+            serializer.is_valid()
+            errors.append(dict(serializer.errors))
+
+        # Resolve every food name of the batch from the in-process catalog
+        foods_by_name = food_catalog.get_many(
+            s.validated_data["food_name"] for s in serializers if not s.errors
+        )
 
-            food_name = serializer.validated_data.get("food_name")
-            quantity = serializer.validated_data.get("quantity")
-            unit = serializer.validated_data.get("unit").lower()
-            meal_type = serializer.validated_data.get("meal_type")
+        resolved = []
+        for index, serializer in enumerate(serializers):
+            if serializer.errors:
+                continue
+
+            item = serializer.validated_data
+            food_name = item.get("food_name")
+            food_item = foods_by_name.get(normalize_food_name(food_name))
+            if food_item is None:
+                errors[index] = {"food_name": [f"Food item '{food_name}' not found in database."]}
+                continue
+            resolved.append((item, food_item))
+
+        # Scale the nutrients of the whole batch in one vectorised pass
+        nutrients = food_catalog.nutrient_engine().compute(
+            (food_item.id, item["quantity"], item.get("unit", "g")) for item, food_item in resolved
+        )
+        meals = [
+            UserMeal(**{
+                **item,
+                **values,
+                "user": user,
+                "food_item": food_item,
+                "food_name": food_item.name,
+            })
+            for (item, food_item), values in zip(resolved, nutrients)
+        ]
 
-            try:
-                food_item = FoodItem.objects.get(name__iexact=food_name)
-            except FoodItem.DoesNotExist:
-                raise ValidationError(f"Food item '{food_name}' not found in database.")
-
-            grams_per_unit = UNIT_TO_GRAMS.get(unit, 100)
-            weight_in_grams = quantity * grams_per_unit
-
-            calories = (weight_in_grams / 100) * food_item.calories
-            protein = (weight_in_grams / 100) * food_item.protein_g
-            carbs = (weight_in_grams / 100) * food_item.carbs_g
-            fats = (weight_in_grams / 100) * food_item.fats_g
-            sugar = (weight_in_grams / 100) * food_item.sugar_g
-            fiber = (weight_in_grams / 100) * food_item.fiber_g
-
-            instance = serializer.save(
-                user=user,
-                food_item=food_item,
-                food_name=food_item.name,
-                meal_type=meal_type,
-                calories=round(calories, 2),
-                protein=round(protein, 2),
-                carbs=round(carbs, 2),
-                fats=round(fats, 2),
-                sugar=round(sugar, 2),
-                fiber=round(fiber, 2),
-            )
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
 
-            response_data.append(self.get_serializer(instance).data)
+        with transaction.atomic():
+            meals = UserMeal.objects.bulk_create(meals)
+            add_meals(meals)
+        meals_changed(user.id)
 
+        response_data = self.get_serializer(meals, many=True).data
         return Response(response_data, status=status.HTTP_201_CREATED)
 
 
+#------------------FOOD SEARCH API ENDPOINTS----------------
+class FoodSearchView(APIView):
+    """
+    Typo-tolerant food search and autocomplete.
+    GET /foods/search/?q=paneer&limit=10&food_type=vegetarian&condition=diabetes&goal=maintain
+    Served entirely from the in-memory catalog index, no database query per lookup.
+    """
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if limit < 1:
+            raise ValidationError({"limit": "Must be at least 1."})
+
+        results = food_catalog.search_index().search(
+            query,
+            limit=limit,
+            food_type=request.query_params.get("food_type"),
+            condition=request.query_params.get("condition"),
+            goal=request.query_params.get("goal"),
+        )
+        data = []
+        for food_item, score in results:
+            item = FoodItemSerializer(food_item).data
+            item["score"] = score
+            data.append(item)
+        return Response({"query": query, "results": data})
+
+
 #------------------CALORIE RECOMMEND API ENDPOINTS----------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response(timeout=60 * 60, depends_on=("profile",))
 def recommend_calories(request):
     try:
-        profile = UserProfile.objects.get(user=request.user)
-
-        weight = profile.weight_kg
-        height = profile.height_cm
-        age = profile.age
-        gender = profile.gender
-        activity_level = profile.activity_level
-        goal = profile.goal
-
-        # Calculate BMR
-        if gender == "male":
-            bmr = 10 * weight + 6.25 * height - 5 * age + 5
-        else:
-            bmr = 10 * weight + 6.25 * height - 5 * age - 161
-
-        # Activity multipliers
-        activity_multipliers = {
-            "sedentary": 1.2,
-            "light": 1.375,
-            "moderate": 1.55,
-            "active": 1.725,
-            "very_active": 1.9,
-        }
-
-        activity_multiplier = activity_multipliers.get(activity_level, 1.2)
-
-        # Adjust for goal
-        maintenance_calories = bmr * activity_multiplier
-
-        if goal == "lose_weight":
-            recommended_calories = maintenance_calories - 500
-        elif goal == "gain_weight":
-            recommended_calories = maintenance_calories + 500
-        else:
-            recommended_calories = maintenance_calories
-
-        return Response({
-            "recommended_calories": round(recommended_calories),
-            "goal": goal,
-            "activity_level": activity_level,
-            "bmr": round(bmr),
-        })
-
+        return Response(get_calorie_target(request.user.id))
     except UserProfile.DoesNotExist:
         return Response({"error": "User profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
+class FoodRecommendationView(APIView):
+    """
+    Foods that best fill what is left of today's calorie and macro targets.
+    GET /recommendations/?limit=10
+    Candidates come from the in-memory catalog, filtered by diet type, health
+    condition and goal; results are cached per user and day until a meal is logged.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @cache_response(timeout=10 * 60, depends_on=("meals", "profile", "foods"))
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), MAX_RECOMMENDATIONS)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if limit < 1:
+            raise ValidationError({"limit": "Must be at least 1."})
+
+        today = localdate()
+        try:
+            remaining, suggestions = recommend_foods(request.user.id, today, limit=limit)
+        except UserProfile.DoesNotExist:
+            return Response({"error": "User profile not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"date": today, "remaining": remaining, "suggestions": suggestions})
+
 ##########################CALORIE TRACKER API ENDPOINTS END##########################
 class DailyCalorieSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cache_response(timeout=10 * 60, depends_on=("meals", "profile"))
     def get(self, request):
-        today = now().date()
-        start = datetime.combine(today, time.min)
-        end = datetime.combine(today, time.max)
-        meals_today = UserMeal.objects.filter(user=request.user, consumed_at__range=(start, end))
-
-
-        totals = meals_today.aggregate(
-            total_calories=Sum("calories"),
-            total_protein=Sum("protein"),
-            total_carbs=Sum("carbs"),
-            total_fats=Sum("fats"),
-            total_sugar=Sum("sugar"),
-            total_fiber=Sum("fiber"),
-        )
+        today = localdate()
+        totals = (
+            DailyNutritionSummary.objects.filter(user=request.user, date=today)
+            .values(*SUMMARY_FIELDS)
+            .first()
+        ) or {}
+
+        try:
+            recommended = get_calorie_target(request.user.id)["recommended_calories"]
+            remaining = round(recommended - totals.get("calories", 0))
+        except UserProfile.DoesNotExist:
+            recommended = remaining = None
 
         return Response({
             "date": today,
-            "calories": totals["total_calories"] or 0,
-            "protein": totals["total_protein"] or 0,
-            "carbs": totals["total_carbs"] or 0,
-            "fats": totals["total_fats"] or 0,
-            "sugar": totals["total_sugar"] or 0,
-            "fiber": totals["total_fiber"] or 0,
+            "calories": totals.get("calories", 0),
+            "protein": totals.get("protein", 0),
+            "carbs": totals.get("carbs", 0),
+            "fats": totals.get("fats", 0),
+            "sugar": totals.get("sugar", 0),
+            "fiber": totals.get("fiber", 0),
+            "glycemic_load": totals.get("glycemic_load", 0),
+            "recommended_calories": recommended,
+            "remaining_calories": remaining,
+        })
+
+
+class NutritionTrendView(APIView):
+    """
+    Nutrient totals and rolling averages over a date range.
+    GET /nutrition/trend/?from=2025-01-01&to=2025-03-31&bucket=day|week|month&window=7
+    - `from`/`to` default to the last 30 days, `bucket` defaults to day.
+    - `window` is the number of buckets in the rolling average.
+    """
+    permission_classes = [IsAuthenticated]
+    max_days = 366 * 3
+    default_windows = {"day": 7, "week": 4, "month": 3}
+
+    def get(self, request):
+        params = request.query_params
+        bucket = params.get("bucket", "day")
+        if bucket not in TREND_BUCKETS:
+            raise ValidationError({"bucket": f"Must be one of: {', '.join(TREND_BUCKETS)}."})
+
+        try:
+            end = date.fromisoformat(params["to"]) if params.get("to") else localdate()
+            start = date.fromisoformat(params["from"]) if params.get("from") else end - timedelta(days=29)
+            window = int(params.get("window", self.default_windows[bucket]))
+        except ValueError as error:
+            raise ValidationError(str(error))
+
+        if start > end:
+            raise ValidationError("'from' must be on or before 'to'.")
+        if (end - start).days >= self.max_days:
+            raise ValidationError(f"The range can span at most {self.max_days} days.")
+        if window < 1:
+            raise ValidationError({"window": "Must be at least 1."})
+
+        return Response({
+            "from": start,
+            "to": end,
+            "bucket": bucket,
+            "window": window,
+            "buckets": nutrition_trend(request.user.id, start, end, bucket=bucket, window=window),
         })
 
 
 ##############################################USER TYPES ROLES ACTORS##############################################
 
-class NutritionistDashboardView(APIView):
+class NutritionistDashboardView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    The nutritionist's assigned patients, cursor-paginated.
+    - Filters: ?diet_type=, ?goal=, ?country=, ?diabetic=true|false, ?search= (name/email)
+    - Ordering: ?ordering=name|-age|... (default id)
+    Each page costs a fixed two queries: the patients (with user and diabetic
+    profile joined, latest rollup id as a subquery) and their latest daily totals.
+    """
+    serializer_class = NutritionistPatientSerializer
+    pagination_class = PatientCursorPagination
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["name", "user__email"]
+    ordering_fields = ["id", "name", "age", "weight_kg"]
+    ordering = ["id"]
+
+    def get_queryset(self):
+        latest_summary = DailyNutritionSummary.objects.filter(user=OuterRef("user")).order_by("-date")
+        patients = (
+            UserProfile.objects.filter(user__assigned_nutritionists__user=self.request.user)
+            .select_related("user", "diabeticprofile")
+            .annotate(latest_summary_id=Subquery(latest_summary.values("id")[:1]))
+        )
+
+        params = self.request.query_params
+        for field in ("diet_type", "goal", "country"):
+            if params.get(field):
+                patients = patients.filter(**{field: params[field]})
+        if params.get("diabetic") in ("true", "false"):
+            patients = patients.filter(diabeticprofile__isnull=params["diabetic"] == "false")
+        return patients
+
+    @role_required(["nutritionist"])
+    @cache_response(timeout=30)
+    def get(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        summaries = DailyNutritionSummary.objects.in_bulk(
+            [profile.latest_summary_id for profile in page if profile.latest_summary_id]
+        )
+        for profile in page:
+            profile.latest_summary = summaries.get(profile.latest_summary_id)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+class NutritionistCalorieTargetsView(APIView):
+    """
+    Recommended calories for many patients in one call.
+    POST {"patient_ids": [3, 7, ...]}, or {} for every assigned patient.
+    Only patients assigned to the nutritionist are returned; requested ids that
+    are not assigned or have no profile are listed under "not_found".
+    """
     @role_required(["nutritionist"])
+    def post(self, request):
+        serializer = PatientIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        patient_ids = serializer.validated_data.get("patient_ids")
+
+        profiles = UserProfile.objects.filter(user__assigned_nutritionists__user=request.user)
+        if patient_ids is not None:
+            profiles = profiles.filter(user_id__in=patient_ids)
+        targets = calculate_calorie_targets(profiles.values("user_id", *TARGET_FIELDS))
+
+        return Response({
+            "results": targets,
+            "not_found": sorted(set(patient_ids or ()) - targets.keys()),
+        })
+
+
+class NutritionistGlycemicLoadView(ReplicaReadMixin, APIView):
+    """
+    Daily glycemic load of the nutritionist's assigned diabetic patients.
+    GET /nutritionist/glycemic-load/?from=2025-01-01&to=2025-01-14&daily=true
+    - `from`/`to` default to the last 14 days; `daily=false` drops the per-day series.
+    - Patients are sorted by average daily glycemic load, highest first.
+    Costs a fixed three queries whatever the number of patients.
+    """
+    max_days = 92
+
+    @role_required(["nutritionist"])
+    @cache_response(timeout=60)
     def get(self, request):
-        # Example: get all patient profiles (in real case, only assigned ones)
-        patients = UserProfile.objects.filter(user__role="user")
-        data = UserProfileSerializer(patients, many=True).data
-        return Response({"patients": data}, status=status.HTTP_200_OK)
+        params = request.query_params
+        try:
+            end = date.fromisoformat(params["to"]) if params.get("to") else localdate()
+            start = date.fromisoformat(params["from"]) if params.get("from") else end - timedelta(days=13)
+        except ValueError as error:
+            raise ValidationError(str(error))
+        if start > end:
+            raise ValidationError("'from' must be on or before 'to'.")
+        if (end - start).days >= self.max_days:
+            raise ValidationError(f"The range can span at most {self.max_days} days.")
+
+        patients = list(
+            DiabeticProfile.objects.filter(user_profile__user__assigned_nutritionists__user=request.user)
+            .values("user_profile__user_id", "user_profile__name", "hba1c", "fasting_blood_sugar", "insulin_dependent")
+        )
+        trends = glycemic_load_trends([patient["user_profile__user_id"] for patient in patients], start, end)
+        include_daily = params.get("daily", "true") != "false"
+
+        results = []
+        for patient in patients:
+            user_id = patient["user_profile__user_id"]
+            trend = trends.get(user_id, {"average": None, "peak": None, "high_days": 0, "days_logged": 0, "daily": []})
+            if not include_daily:
+                trend.pop("daily")
+            results.append({
+                "user_id": user_id,
+                "name": patient["user_profile__name"],
+                "hba1c": patient["hba1c"],
+                "fasting_blood_sugar": patient["fasting_blood_sugar"],
+                "insulin_dependent": patient["insulin_dependent"],
+                **trend,
+            })
+        results.sort(key=lambda entry: (entry["average"] is None, -(entry["average"] or 0)))
+
+        return Response({
+            "from": start,
+            "to": end,
+            "high_threshold": HIGH_DAILY_GLYCEMIC_LOAD,
+            "patients": results,
+        })
 
 
-class OwnerDashboardView(APIView):
+class OwnerDashboardView(ReplicaReadMixin, APIView):
     @role_required(["owner"])
     def get(self, request):
-        today = now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-
-        # Core Metrics
-        total_users = User.objects.filter(role="user").count()
-        new_users_week = User.objects.filter(role="user", date_joined__gte=week_ago).count()
-        new_users_month = User.objects.filter(role="user", date_joined__gte=month_ago).count()
-        active_patients = UserMeal.objects.filter(date__gte=week_ago).values("user").distinct().count()
-
-        estimated_revenue = active_patients * 49
-        meals_logged_week = UserMeal.objects.filter(date__gte=week_ago).count()
-        meals_logged_month = UserMeal.objects.filter(date__gte=month_ago).count()
-        
-
-        # Country-wise User Count
-        users_by_country = (
-            UserProfile.objects.values("country")
-            .annotate(user_count=Count("id"))
-            .order_by("-user_count")
-        )
+        # Cached, single-pass metrics (see app/dashboard.py)
+        metrics = get_owner_metrics()
 
-        # Dummy promotion and feedback placeholder
+        # Dummy feedback placeholder
         feedbacks = 0
-        promotions = [
-            {"campaign": "Instagram Ad", "reach": "10k+", "status": "Running"},
-            {"campaign": "Referral Program", "reach": "5k+", "status": "Ended"},
-        ]
 
         return Response({
-            "date": str(today),
-            "user_stats": {
-                "total_users": total_users,
-                "new_users_week": new_users_week,
-                "new_users_month": new_users_month,
-                "active_patients_week": active_patients,
-            },
-            "usage": {
-                "meals_logged_week": meals_logged_week,
-                "meals_logged_month": meals_logged_month,
-            },
-            "revenue": f"₹{estimated_revenue}",
-            "users_by_country": users_by_country,
+            **metrics,
             "feedback_collected": feedbacks,
-            "promotions": promotions,
+            "promotions": OWNER_PROMOTIONS,
             "message": "Owner dashboard data fetched successfully"
         }, status=status.HTTP_200_OK)
 
 
+class ReportHistoryView(ReplicaReadMixin, APIView):
+    """
+    Daily AppReport snapshots for owners and operators, newest last.
+    GET /reports/history/?days=90
+    Snapshots are written by `manage.py generate_app_reports`, so this never
+    re-aggregates the raw user and meal tables.
+    """
+    max_days = 366 * 3
+
+    @role_required(["owner", "operator"])
+    def get(self, request):
+        try:
+            days = min(int(request.query_params.get("days", 30)), self.max_days)
+        except ValueError:
+            raise ValidationError({"days": "Must be an integer."})
+        if days < 1:
+            raise ValidationError({"days": "Must be at least 1."})
+
+        since = localdate() - timedelta(days=days)
+        reports = AppReport.objects.filter(report_date__gte=since).order_by("report_date")
+        return Response({"reports": AppReportSerializer(reports, many=True).data})
+
+
 
 
 
@@ -318,66 +516,150 @@ class IsOperator(permissions.BasePermission):
 
 # ✅ Create & list reminders
 class ReminderListCreateView(generics.ListCreateAPIView):
-    queryset = PatientReminder.objects.all()
+    """
+    Lists reminders newest first (cursor-paginated) or creates one.
+    Filters: ?user=<id>, ?sent=true|false, ?recurrence=daily, ?search=<title>
+    """
     serializer_class = PatientReminderSerializer
     permission_classes = [IsOperator]
+    pagination_class = ReminderCursorPagination
+    filter_backends = [filters.SearchFilter]
+    search_fields = ["title"]
+
+    def get_queryset(self):
+        reminders = PatientReminder.objects.all()
+        params = self.request.query_params
+        if params.get("user"):
+            try:
+                reminders = reminders.filter(user_id=int(params["user"]))
+            except ValueError:
+                raise ValidationError({"user": "Must be an integer."})
+        if params.get("sent") in ("true", "false"):
+            reminders = reminders.filter(sent_at__isnull=params["sent"] == "false")
+        if params.get("recurrence"):
+            recurrences = [value for value, _ in PatientReminder.RECURRENCE_CHOICES]
+            if params["recurrence"] not in recurrences:
+                raise ValidationError({"recurrence": f"Must be one of: {', '.join(recurrences)}."})
+            reminders = reminders.filter(recurrence=params["recurrence"])
+        return reminders
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+
+class ReminderCampaignView(APIView):
+    """
+    Sends one reminder to every patient matching an audience filter.
+    POST {"title": "...", "message": "...", "audience": {"country": "India", "diabetic": true, "min_hba1c": 8}}
+    The audience is resolved in SQL and the reminders are inserted in chunks.
+    """
+    permission_classes = [IsOperator]
+
+    def post(self, request):
+        serializer = ReminderCampaignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reminder_fields = dict(serializer.validated_data)
+        audience = reminder_fields.pop("audience")
+
+        created = create_campaign(audience, created_by=request.user, **reminder_fields)
+        return Response({"created": created}, status=status.HTTP_201_CREATED)
 
 
 class SendReminderView(APIView):
+    """
+    Queues one reminder for the dispatch worker (`manage.py dispatch_reminders`),
+    so the request never waits on SMTP.
+    """
     permission_classes = [IsOperator]
 
     def post(self, request, pk):
-        try:
-            reminder = PatientReminder.objects.get(pk=pk)
-            # Simulate sending email/SMS
-            reminder.sent = True
-            reminder.save()
-
-            # Optional: Send email (only if you set up SMTP)
-            # send_mail(
-            #     subject="Health Reminder",
-            #     message=reminder.message,
-            #     from_email="admin@yourapp.com",
-            #     recipient_list=[reminder.user.email],
-            # )
-
-            return Response({"status": "Reminder sent!"})
-        except PatientReminder.DoesNotExist:
+        reminders = PatientReminder.objects.filter(pk=pk)
+        if not reminders.exists():
             return Response({"error": "Reminder not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not enqueue_reminders(reminders):
+            return Response({"status": "Reminder was already sent or queued."})
+        return Response({"status": "Reminder queued for sending."}, status=status.HTTP_202_ACCEPTED)
+
+
+class BulkSendReminderView(APIView):
+    """
+    Queues many reminders at once with a single UPDATE.
+    POST {"ids": [1, 2, 3]}   -> queue these reminders
+    POST {"all_due": true}    -> queue every unsent reminder whose date has passed
+    """
+    permission_classes = [IsOperator]
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        if request.data.get("all_due"):
+            reminders = PatientReminder.objects.filter(date__lte=now())
+        elif isinstance(ids, list) and ids and all(isinstance(pk, int) for pk in ids):
+            reminders = PatientReminder.objects.filter(pk__in=ids)
+        else:
+            raise ValidationError("Provide a non-empty list of integer 'ids' or 'all_due': true.")
+
+        queued = enqueue_reminders(reminders)
+        return Response({"queued": queued}, status=status.HTTP_202_ACCEPTED)
 
 
 # ✅ Get all users' contact info
+class EchoBuffer:
+    """Pseudo file whose write() returns the value, so csv.writer can feed a streaming response."""
+    def write(self, value):
+        return value
+
+
 class UserContactListView(generics.ListAPIView):
+    """
+    Patient contact details for operators, read with one joined query.
+    - GET /operator/users/contacts/?page_size=500  -> keyset (cursor) pages ordered by id
+    - GET /operator/users/contacts/?export=csv|ndjson -> every patient, streamed with
+      a server-side cursor so memory stays flat however many patients there are.
+    """
     permission_classes = [IsOperator]
+    pagination_class = ContactCursorPagination
+    export_chunk_size = 2000
+    export_fields = ["id", "email", "contact_number", "country"]
+
+    def get_queryset(self):
+        # LEFT JOIN on the profile: users without one get None for both columns
+        return User.objects.filter(role="user").values(
+            "id",
+            "email",
+            contact_number=F("userprofile__mobile_number"),
+            country=F("userprofile__country"),
+        )
 
     def get(self, request):
-        users = User.objects.filter(role="user")
-        data = []
+        export = request.query_params.get("export")
+        if export:
+            return self.export(export)
+
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(page)
+
+    def export(self, export_format):
+        rows = self.get_queryset().order_by("id").iterator(chunk_size=self.export_chunk_size)
+
+        if export_format == "csv":
+            writer = csv.writer(EchoBuffer())
+            lines = chain(
+                [writer.writerow(self.export_fields)],
+                (writer.writerow([row[field] for field in self.export_fields]) for row in rows),
+            )
+            response = StreamingHttpResponse(lines, content_type="text/csv")
+            response["Content-Disposition"] = 'attachment; filename="patient_contacts.csv"'
+            return response
 
-        for u in users:
-            # Check if user has a profile before accessing it
-            if hasattr(u, "userprofile"):
-                profile = u.userprofile
-                data.append({
-                    "id": u.id,
-                    "email": u.email,
-                    "contact_number": profile.mobile_number,  # assuming contact_number is here
-                    "country": profile.country,
-                })
-            else:
-                # fallback if profile missing
-                data.append({
-                    "id": u.id,
-                    "email": u.email,
-                    "contact_number": None,
-                    "country": None,
-                })
-
-        return Response(data)
+        if export_format == "ndjson":
+            lines = (json.dumps(row) + "\n" for row in rows)
+            return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+        raise ValidationError({"export": "Must be 'csv' or 'ndjson'."})
 
 
 # ✅ Compile report (basic version for Owner)
-class OperatorReportView(APIView):
+class OperatorReportView(ReplicaReadMixin, APIView):
     permission_classes = [IsOperator]
 
     def get(self, request):
@@ -387,6 +669,34 @@ class OperatorReportView(APIView):
         return Response({
             "total_users": user_count,
             "reminders_sent": reminders_sent,
+            "food_catalog_cache": food_catalog.stats(),
+            "recommendation_cache": recommendation_cache.stats(),
+            "response_cache": response_cache_stats.stats(),
         })
     
+class OperatorMetricsView(APIView):
+    """
+    In-process request metrics from RequestMetricsMiddleware (per view:
+    latency, DB, serializer and render time, query count histograms, response size)
+    plus the hit rates of the in-process and response caches.
+    GET /operator/metrics/, DELETE to reset the request histograms.
+    Numbers are per worker process.
+    """
+    permission_classes = [IsOperator]
+
+    def get(self, request):
+        return Response({
+            "views": request_metrics.snapshot(),
+            "caches": {
+                "food_catalog": food_catalog.stats(),
+                "recommendations": recommendation_cache.stats(),
+                "responses": response_cache_stats.stats(),
+            },
+        })
+
+    def delete(self, request):
+        request_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 #########################################################################################################################################3
\ No newline at end of file
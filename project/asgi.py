@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 application = get_asgi_application()
+
+from app.catalog import warm_food_catalog  # noqa: E402  (needs the apps loaded)
+
+warm_food_catalog()
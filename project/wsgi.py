@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 application = get_wsgi_application()
+
+from app.catalog import warm_food_catalog  # noqa: E402  (needs the apps loaded)
+
+warm_food_catalog()
@@ -25,4 +25,42 @@ def role_required(allowed_roles):
                 return HttpResponseForbidden("Access Denied")
             return view_func(self, request, *args, **kwargs)
         return _wrapped_view
-    return decorator
\ No newline at end of file
+    return decorator
+
+# Activity multipliers applied to BMR (Mifflin-St Jeor) for maintenance calories
+ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very_active": 1.9,
+}
+
+# Daily calorie adjustment per goal
+GOAL_ADJUSTMENTS = {
+    "lose_weight": -500,
+    "gain_weight": 500,
+}
+
+
+def calculate_calorie_target(weight, height, age, gender, activity_level, goal):
+    """
+    Returns the recommended daily calories for a profile:
+    BMR (Mifflin-St Jeor) x activity multiplier, adjusted for the goal.
+    """
+    # Calculate BMR
+    if gender == "male":
+        bmr = 10 * weight + 6.25 * height - 5 * age + 5
+    else:
+        bmr = 10 * weight + 6.25 * height - 5 * age - 161
+
+    activity_multiplier = ACTIVITY_MULTIPLIERS.get(activity_level, 1.2)
+    maintenance_calories = bmr * activity_multiplier
+    recommended_calories = maintenance_calories + GOAL_ADJUSTMENTS.get(goal, 0)
+
+    return {
+        "recommended_calories": round(recommended_calories),
+        "goal": goal,
+        "activity_level": activity_level,
+        "bmr": round(bmr),
+    }